@@ -0,0 +1,88 @@
+"""In-process caches"""
+
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Hashable, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class TTLCache:
+    """
+    A small LRU cache whose entries expire after a time-to-live.
+    Not shared between worker processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if ttl is None:
+            ttl = self.ttl
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a single entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+
+class RequestCacheMiddleware:
+    """Give each HTTP request its own empty REQUEST_USERS memo."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = REQUEST_USERS.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            REQUEST_USERS.reset(token)
+
+
+# Users looked up by get_current_user, keyed by username
+USER_CACHE = TTLCache(maxsize=256, ttl=30)
+
+# Users looked up during the current request, keyed by username
+REQUEST_USERS: ContextVar[Optional[dict]] = ContextVar("request_users", default=None)
+
+# Decoded access tokens keyed by a token digest; False marks a rejected token
+TOKEN_CACHE = TTLCache(maxsize=10_000, ttl=60)
+
+# Categories looked up by id or name, keyed by ("id", id) / ("name", name)
+CATEGORY_CACHE = TTLCache(maxsize=256, ttl=60)
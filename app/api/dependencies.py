@@ -1,74 +1,103 @@
 """API dependencies"""
 
+import asyncio
+import re
 from typing import Optional
 
+import aiosqlite
 from fastapi import Depends, HTTPException, status, Request
-from fastapi.security import OAuth2PasswordBearer
 
-from app.database import get_db as _get_db
+from app.config import DB_POOL_TIMEOUT
+from app.api.cache import USER_CACHE
 from app.api.services.auth_service import decode_access_token, get_user_by_username
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+# Matches the auth cookie as set by /auth/login, quoted or not
+_COOKIE_TOKEN_RE = re.compile(r'(?:^|;)\s*access_token="?Bearer(?: |%20)([^";]+)')
 
 
-async def get_db():
+async def get_db(request: Request) -> aiosqlite.Connection:
     """
     Database dependency.
+    Borrows a connection from the application pool; DBConnectionMiddleware
+    returns it once the response has been sent.
     """
-    db = await _get_db()
+    pool = request.app.state.db_pool
+
     try:
-        yield db
-    finally:
-        await db.close()
+        db = await asyncio.wait_for(pool.get(), timeout=DB_POOL_TIMEOUT)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is busy, please try again",
+        )
 
+    request.state.db = db
+    return db
 
-async def get_current_user(
-    request: Request,
-    token: Optional[str] = Depends(oauth2_scheme),
-    db=Depends(get_db),
-):
-    """
-    Get the current authenticated user.
-    Checks both Authorization header and HTTP-only cookie.
-    Raises HTTPException if not authenticated.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Not authenticated",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
-    if not token:
-        cookie_token = request.cookies.get("access_token")
-        if cookie_token and cookie_token.startswith("Bearer "):
-            token = cookie_token[7:]  # Remove "Bearer " prefix
+def _extract_token(request: Request) -> Optional[str]:
+    """Get the bearer token from the Authorization header or the auth cookie."""
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
 
-    if not token:
-        raise credentials_exception
+    if scheme.lower() == "bearer" and credentials:
+        return credentials
 
+    return _extract_cookie_token(request)
+
+
+def _extract_cookie_token(request: Request) -> Optional[str]:
+    """Get the bearer token stored in the auth cookie, if any."""
+    match = _COOKIE_TOKEN_RE.search(request.headers.get("cookie", ""))
+    return match.group(1) if match else None
+
+
+async def _resolve_user(db, token: str) -> Optional[dict]:
+    """Get the user a token belongs to, or None if the token is not valid."""
     token_data = decode_access_token(token)
 
     if token_data is None or token_data.username is None:
-        raise credentials_exception
+        return None
+
+    user = USER_CACHE.get(token_data.username)
+
+    if user is None:
+        user = await get_user_by_username(db, token_data.username)
+
+        if user is None:
+            return None
+
+        USER_CACHE.set(token_data.username, user)
+
+    return user
 
-    user = await get_user_by_username(db, token_data.username)
+
+async def get_current_user(request: Request, db=Depends(get_db)):
+    """
+    Get the current authenticated user.
+    Checks both Authorization header and HTTP-only cookie.
+    Raises HTTPException if not authenticated.
+    """
+    token = _extract_token(request)
+    user = await _resolve_user(db, token) if token else None
 
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return user
 
 
-async def get_optional_user(
-    request: Request,
-    token: Optional[str] = Depends(oauth2_scheme),
-    db=Depends(get_db),
-):
+async def get_optional_user(request: Request, db=Depends(get_db)):
     """
     Get the current user if authenticated, None otherwise.
     """
-    try:
-        return await get_current_user(request, token, db)
-    except HTTPException:
+    token = _extract_token(request)
+
+    if not token:
         return None
+
+    return await _resolve_user(db, token)
@@ -0,0 +1,22 @@
+"""Shared response helpers"""
+
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+
+
+def etag_response(request: Request, content: Any) -> Response:
+    """
+    Serialize content and tag it with a hash of the body.
+    Answers 304 Not Modified when the client already holds the same body.
+    """
+    body = orjson.dumps(content)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(body, media_type="application/json", headers=headers)
@@ -2,9 +2,11 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 
 from app.api.dependencies import get_db, get_current_user
+from app.api.responses import etag_response
 from app.api.schemas.account import (
     InvestmentCreate,
     AccountUpdate,
@@ -14,7 +16,11 @@ from app.api.schemas.account import (
 )
 from app.api.services import account_service
 
-router = APIRouter(prefix="/accounts", tags=["accounts"])
+router = APIRouter(
+    prefix="/accounts",
+    tags=["accounts"],
+    default_response_class=ORJSONResponse,
+)
 
 
 @router.post(
@@ -37,19 +43,23 @@ async def list_accounts(
     _=Depends(get_current_user),
 ):
     """List all accounts with optional filters."""
-    return await account_service.get_all_accounts(db, account_type, is_active)
+    result = await account_service.get_all_accounts(db, account_type, is_active)
+    return ORJSONResponse(content=result.model_dump(mode="json"))
 
 
 @router.get("/summary", response_model=AccountSummary)
 async def get_accounts_summary(
+    request: Request,
+    include_accounts: bool = True,
     db=Depends(get_db),
     _=Depends(get_current_user),
 ):
     """Get a summary of all accounts (for dashboard)."""
-    return await account_service.get_account_summary(db)
+    summary = await account_service.get_account_summary(db, include_accounts)
+    return etag_response(request, summary.model_dump(mode="json"))
 
 
-@router.get("/{account_id}", response_model=AccountResponse)
+@router.get("/{account_id:int}", response_model=AccountResponse)
 async def get_account(
     account_id: int,
     db=Depends(get_db),
@@ -60,14 +70,13 @@ async def get_account(
 
     if not account:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Account not found"
         )
 
-    return account
+    return ORJSONResponse(content=account.model_dump(mode="json"))
 
 
-@router.patch("/{account_id}", response_model=AccountResponse)
+@router.patch("/{account_id:int}", response_model=AccountResponse)
 async def update_account(
     account_id: int,
     account: AccountUpdate,
@@ -75,28 +84,26 @@ async def update_account(
     _=Depends(get_current_user),
 ):
     """Update an account."""
-    existing = await account_service.get_account(db, account_id)
+    updated = await account_service.update_account(db, account_id, account)
 
-    if not existing:
+    if not updated:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Account not found"
         )
 
-    return await account_service.update_account(db, account_id, account)
+    return ORJSONResponse(content=updated.model_dump(mode="json"))
 
 
-@router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{account_id:int}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_account(
     account_id: int,
     db=Depends(get_db),
     _=Depends(get_current_user),
 ):
     """Delete an account."""
-    deleted = await account_service.get_account(db, account_id)
+    deleted = await account_service.delete_account(db, account_id)
 
     if not deleted:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Account not found"
         )
@@ -63,23 +63,12 @@ async def logout(response: Response):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
-    current_user=Depends(get_current_user),
-    db=Depends(get_db),
-):
+async def get_current_user_info(current_user=Depends(get_current_user)):
     """Get current user information."""
-    user = await auth_service.get_user_by_username(db, current_user["username"])
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
     return UserResponse(
-        id=user["id"],
-        username=user["username"],
-        created_at=user["created_at"],
+        id=current_user["id"],
+        username=current_user["username"],
+        created_at=current_user["created_at"],
     )
 
 
@@ -44,7 +44,7 @@ async def list_categories(
     return await category_service.get_all_categories(db, type, is_active)
 
 
-@router.get("/{category_id}", response_model=CategoryResponse)
+@router.get("/{category_id:int}", response_model=CategoryResponse)
 async def get_category(
     category_id: int,
     db=Depends(get_db),
@@ -55,14 +55,13 @@ async def get_category(
 
     if not category:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Category not found",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
         )
 
     return category
 
 
-@router.patch("/{category_id}", response_model=CategoryResponse)
+@router.patch("/{category_id:int}", response_model=CategoryResponse)
 async def update_category(
     category_id: int,
     category: CategoryUpdate,
@@ -70,27 +69,31 @@ async def update_category(
     _=Depends(get_current_user),
 ):
     """Update a category."""
-    existing = await category_service.get_category(db, category_id)
-
-    if not existing:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Category not found",
-        )
-
-    # Check for name conflict if updating name
-    if category.name and category.name != existing.name:
+    # Check for name conflict if updating name; a missing category is still
+    # reported as not found rather than as a conflict
+    if category.name:
         conflict = await category_service.get_category_by_name(db, category.name)
-        if conflict:
+        if conflict and conflict.id != category_id:
+            if not await category_service.get_category(db, category_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="A category with this name already exists",
             )
 
-    return await category_service.update_category(db, category_id, category)
+    updated = await category_service.update_category(db, category_id, category)
+
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
+        )
+
+    return updated
 
 
-@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{category_id:int}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
     category_id: int,
     db=Depends(get_db),
@@ -101,6 +104,5 @@ async def delete_category(
 
     if not deleted:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Category not found",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
         )
@@ -3,9 +3,11 @@
 from typing import Optional
 
 import aiosqlite
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 
 from app.api.dependencies import get_db, get_current_user
+from app.api.responses import etag_response
 from app.api.schemas.loan import (
     LoanCreate,
     LoanUpdate,
@@ -14,6 +16,7 @@ from app.api.schemas.loan import (
     AmortizationSchedule,
     LoanPayment,
     LoanPaymentResponse,
+    LoanPaymentListResponse,
     LoanSummary,
 )
 from app.api.services import loan_service
@@ -22,6 +25,7 @@ router = APIRouter(
     prefix="/api/loans",
     tags=["loans"],
     dependencies=[Depends(get_current_user)],
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -40,24 +44,27 @@ async def list_loans(
     db: aiosqlite.Connection = Depends(get_db),
 ):
     """Get all loans."""
-    return await loan_service.get_all_loans(db, is_active)
+    result = await loan_service.get_all_loans(db, is_active)
+    return ORJSONResponse(content=result.model_dump(mode="json"))
 
 
 @router.get("/summary", response_model=LoanSummary)
 async def get_loan_summary(
+    request: Request,
     db: aiosqlite.Connection = Depends(get_db),
 ):
     """Get summary of all loans for dashboard."""
-    return await loan_service.get_loan_summary(db)
+    summary = await loan_service.get_loan_summary(db)
+    return etag_response(request, summary.model_dump(mode="json"))
 
 
-@router.get("/{loan_id}", response_model=LoanResponse)
+@router.get("/{loan_id:int}", response_model=LoanResponse)
 async def get_loan(
     loan_id: int,
     db: aiosqlite.Connection = Depends(get_db),
 ):
     """Get a single loan by ID."""
-    loan = await loan_service.get_loan_by_id(db, loan_id)
+    loan = await loan_service.get_loan(db, loan_id)
 
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
@@ -65,7 +72,7 @@ async def get_loan(
     return loan
 
 
-@router.get("/{loan_id}/amortization", response_model=AmortizationSchedule)
+@router.get("/{loan_id:int}/amortization", response_model=AmortizationSchedule)
 async def get_amortization_schedule(
     loan_id: int,
     db: aiosqlite.Connection = Depends(get_db),
@@ -79,21 +86,25 @@ async def get_amortization_schedule(
     return schedule
 
 
-@router.get("/{loan_id}/payments", response_model=list[LoanPaymentResponse])
+@router.get("/{loan_id:int}/payments", response_model=LoanPaymentListResponse)
 async def get_loan_payments(
     loan_id: int,
     limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     db: aiosqlite.Connection = Depends(get_db),
 ):
-    """Get payment history for a loan."""
-    loan = await loan_service.get_loan(db, loan_id)
-    if not loan:
+    """Get a page of payment history for a loan, with the total count."""
+    payments = await loan_service.get_loan_payments(db, loan_id, limit, offset)
+
+    if payments is None:
         raise HTTPException(status_code=404, detail="Loan not found")
 
-    return await loan_service.get_loan_payments(db, loan_id, limit)
+    return payments
 
 
-@router.post("/{loan_id}/payments", response_model=LoanPaymentResponse, status_code=201)
+@router.post(
+    "/{loan_id:int}/payments", response_model=LoanPaymentResponse, status_code=201
+)
 async def record_payment(
     loan_id: int,
     payment: LoanPayment,
@@ -114,7 +125,7 @@ async def record_payment(
     return result
 
 
-@router.patch("/{loan_id}", response_model=LoanResponse)
+@router.patch("/{loan_id:int}", response_model=LoanResponse)
 async def update_loan(
     loan_id: int,
     update: LoanUpdate,
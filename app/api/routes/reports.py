@@ -4,9 +4,11 @@ from typing import Optional
 from datetime import date
 
 import aiosqlite
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from app.api.dependencies import get_db, get_current_user
+from app.api.responses import etag_response
 from app.api.schemas.report import (
     SpendingByCategory,
     SpendingTrends,
@@ -18,6 +20,7 @@ router = APIRouter(
     prefix="/api/reports",
     tags=["reports"],
     dependencies=[Depends(get_current_user)],
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -38,6 +41,7 @@ async def get_spending_by_category(
 
 @router.get("/spending-trends", response_model=SpendingTrends)
 async def get_spending_trends(
+    request: Request,
     months: int = Query(12, ge=1, le=36, description="Number of months to include"),
     account_id: Optional[int] = Query(None, description="Filter by account"),
     db: aiosqlite.Connection = Depends(get_db),
@@ -45,18 +49,21 @@ async def get_spending_trends(
     """
     Get monthly income and expense trends.
     """
-    return await report_service.get_spending_trends(db, months, account_id)
+    trends = await report_service.get_spending_trends(db, months, account_id)
+    return etag_response(request, trends.model_dump(mode="json"))
 
 
 @router.get("/net-worth", response_model=NetWorthHistory)
 async def get_net_worth_history(
+    request: Request,
     months: int = Query(12, ge=1, le=36, description="Number of months of history"),
     db: aiosqlite.Connection = Depends(get_db),
 ):
     """
     Get net worth history over time.
     """
-    return await report_service.get_net_worth_history(db, months)
+    history = await report_service.get_net_worth_history(db, months)
+    return etag_response(request, history.model_dump(mode="json"))
 
 
 @router.get("/export/transactions")
@@ -70,7 +77,7 @@ async def export_transactions(
     """
     Export transactions to CSV file.
     """
-    csv_content = await report_service.export_transactions_csv(
+    csv_stream = report_service.export_transactions_csv(
         db, start_date, end_date, account_id, category_id
     )
 
@@ -80,8 +87,8 @@ async def export_transactions(
     else:
         filename = f"transactions_{date.today()}.csv"
 
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        csv_stream,
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -92,10 +99,10 @@ async def export_accounts(
     db: aiosqlite.Connection = Depends(get_db),
 ):
     """Export accounts to CSV file."""
-    csv_content = await report_service.export_accounts_csv(db)
+    csv_stream = report_service.export_accounts_csv(db)
 
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        csv_stream,
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename=accounts_{date.today()}.csv"
@@ -108,10 +115,10 @@ async def export_subscriptions(
     db: aiosqlite.Connection = Depends(get_db),
 ):
     """Export subscriptions to CSV file."""
-    csv_content = await report_service.export_subscriptions_csv(db)
+    csv_stream = report_service.export_subscriptions_csv(db)
 
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        csv_stream,
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename=subscriptions_{date.today()}.csv"
@@ -124,10 +131,10 @@ async def export_loans(
     db: aiosqlite.Connection = Depends(get_db),
 ):
     """Export loans to CSV file."""
-    csv_content = await report_service.export_loans_csv(db)
+    csv_stream = report_service.export_loans_csv(db)
 
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        csv_stream,
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename=loans_{date.today()}.csv"
@@ -4,6 +4,7 @@ from typing import Optional
 
 import aiosqlite
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
 from app.api.dependencies import get_db, get_current_user
 from app.api.schemas.subscription import (
@@ -19,6 +20,7 @@ router = APIRouter(
     prefix="/api/subscriptions",
     tags=["subscriptions"],
     dependencies=[Depends(get_current_user)],
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -39,7 +41,8 @@ async def list_subscriptions(
     """
     Get all subscriptions.
     """
-    return await subscription_service.get_all_subscriptions(db, is_active)
+    result = await subscription_service.get_subscription_dicts(db, is_active)
+    return ORJSONResponse(content=result)
 
 
 @router.get("/upcoming", response_model=list[UpcomingRenewal])
@@ -52,7 +55,7 @@ async def get_upcoming_renewals(
     return await subscription_service.get_upcoming_renewals(db, days, limit)
 
 
-@router.get("/{subscription_id}", response_model=SubscriptionResponse)
+@router.get("/{subscription_id:int}", response_model=SubscriptionResponse)
 async def get_subscription(
     subscription_id: int,
     db: aiosqlite.Connection = Depends(get_db),
@@ -66,7 +69,7 @@ async def get_subscription(
     return subscription
 
 
-@router.patch("/{subscription_id}", response_model=SubscriptionResponse)
+@router.patch("/{subscription_id:int}", response_model=SubscriptionResponse)
 async def update_subscription(
     subscription_id: int,
     update: SubscriptionUpdate,
@@ -83,7 +86,7 @@ async def update_subscription(
     return subscription
 
 
-@router.delete("/{subscription_id}", status_code=204)
+@router.delete("/{subscription_id:int}", status_code=204)
 async def delete_subscription(
     subscription_id: int,
     db: aiosqlite.Connection = Depends(get_db),
@@ -95,7 +98,15 @@ async def delete_subscription(
         raise HTTPException(status_code=404, detail="Subscription not found")
 
 
-@router.post("/{subscription_id}/advance", response_model=SubscriptionResponse)
+@router.post("/advance-due", response_model=list[SubscriptionResponse])
+async def advance_all_due(db: aiosqlite.Connection = Depends(get_db)):
+    """
+    Advance every active subscription that is due by one billing cycle.
+    """
+    return await subscription_service.advance_all_due(db)
+
+
+@router.post("/{subscription_id:int}/advance", response_model=SubscriptionResponse)
 async def advance_billing_date(
     subscription_id: int,
     db: aiosqlite.Connection = Depends(get_db),
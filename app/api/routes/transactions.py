@@ -1,11 +1,14 @@
 """ "Transaction routes"""
 
+import asyncio
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import ORJSONResponse
 
 from app.api.dependencies import get_db, get_current_user
+from app.api.responses import etag_response
 from app.api.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
@@ -16,7 +19,11 @@ from app.api.schemas.transaction import (
 from app.api.services import transaction_service
 from app.api.services import account_service
 
-router = APIRouter(prefix="/transactions", tags=["transactions"])
+router = APIRouter(
+    prefix="/transactions",
+    tags=["transactions"],
+    default_response_class=ORJSONResponse,
+)
 
 
 @router.post(
@@ -28,16 +35,20 @@ async def create_transaction(
     _=Depends(get_current_user),
 ):
     """Create a new transaction."""
-    account = await account_service.get_account(db, transaction.account_id)
+    if transaction.transfer_to_account_id:
+        account, dest_account = await asyncio.gather(
+            account_service.get_account(db, transaction.account_id),
+            account_service.get_account(db, transaction.transfer_to_account_id),
+        )
+    else:
+        account = await account_service.get_account(db, transaction.account_id)
+
     if not account:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Account not found"
         )
 
     if transaction.transfer_to_account_id:
-        dest_account = await account_service.get_account(
-            db, transaction.transfer_to_account_id
-        )
         if not dest_account:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -68,7 +79,7 @@ async def list_transactions(
     _=Depends(get_current_user),
 ):
     """List transactions with optional filters."""
-    return await transaction_service.get_transactions(
+    result = await transaction_service.get_transaction_dicts(
         db,
         account_id=account_id,
         category_id=category_id,
@@ -81,29 +92,36 @@ async def list_transactions(
         offset=offset,
     )
 
+    # Rows come straight from our own schema; skip FastAPI's response validation
+    return ORJSONResponse(content=result)
+
 
 @router.get("/recent", response_model=list[TransactionResponse])
 async def get_recent_transactions(
+    request: Request,
     limit: int = Query(default=10, ge=1, le=50),
     db=Depends(get_db),
     _=Depends(get_current_user),
 ):
     """Get the most recent transactions."""
-    return await transaction_service.get_recent_transactions(db, limit)
+    transactions = await transaction_service.get_recent_transactions(db, limit)
+    return etag_response(request, [t.model_dump(mode="json") for t in transactions])
 
 
 @router.get("/monthly-spending", response_model=MonthlySpendingResponse)
 async def get_monthly_spending(
+    request: Request,
     year: int = Query(..., ge=2000, le=2100),
     month: int = Query(..., ge=1, le=12),
     db=Depends(get_db),
     _=Depends(get_current_user),
 ):
     """Get spending by category for a specific month."""
-    return await transaction_service.get_monthly_spending(db, year, month)
+    spending = await transaction_service.get_monthly_spending(db, year, month)
+    return etag_response(request, spending.model_dump(mode="json"))
 
 
-@router.get("/{transaction_id}", response_model=TransactionResponse)
+@router.get("/{transaction_id:int}", response_model=TransactionResponse)
 async def get_transaction(
     transaction_id: int,
     db=Depends(get_db),
@@ -120,7 +138,7 @@ async def get_transaction(
     return transaction
 
 
-@router.patch("/{transaction_id}", response_model=TransactionResponse)
+@router.patch("/{transaction_id:int}", response_model=TransactionResponse)
 async def update_transaction(
     transaction_id: int,
     transaction: TransactionUpdate,
@@ -128,17 +146,19 @@ async def update_transaction(
     _=Depends(get_current_user),
 ):
     """Update a transaction."""
-    existing = await transaction_service.get_transaction(db, transaction_id)
+    updated = await transaction_service.update_transaction(
+        db, transaction_id, transaction
+    )
 
-    if not existing:
+    if not updated:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found"
         )
 
-    return await transaction_service.update_transaction(db, transaction_id, transaction)
+    return updated
 
 
-@router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{transaction_id:int}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_transaction(
     transaction_id: int,
     db=Depends(get_db),
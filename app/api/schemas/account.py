@@ -97,7 +97,7 @@ class AccountResponse(BaseModel):
     loan_paid: Optional[float] = None
     loan_remaining: Optional[float] = None
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class AccountListResponse(BaseModel):
@@ -30,6 +30,7 @@ class TokenData(BaseModel):
     """Schema for decoded token data."""
 
     username: str | None = None
+    expires_at: datetime | None = None
 
 
 class UserResponse(BaseModel):
@@ -39,4 +40,4 @@ class UserResponse(BaseModel):
     username: str
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
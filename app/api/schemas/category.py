@@ -38,7 +38,7 @@ class CategoryResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class CategoryListResponse(BaseModel):
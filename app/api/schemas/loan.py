@@ -2,6 +2,7 @@
 
 import math
 from datetime import date, datetime
+from functools import cached_property
 from typing import Optional, Literal
 
 from pydantic import BaseModel, Field, computed_field
@@ -49,7 +50,10 @@ class LoanUpdate(BaseModel):
 
 
 class LoanResponse(LoanBase):
-    """Schema for loan response with computed fields."""
+    """
+    Schema for loan response with computed fields.
+    Derived values are cached per instance; responses are not mutated.
+    """
 
     id: int
     current_balance: float
@@ -73,7 +77,7 @@ class LoanResponse(LoanBase):
         return types.get(self.loan_type, self.loan_type)
 
     @computed_field
-    @property
+    @cached_property
     def progress_percent(self) -> float:
         """Percentage of loan paid off."""
         if self.original_principal <= 0:
@@ -82,7 +86,7 @@ class LoanResponse(LoanBase):
         return round((paid / self.original_principal) * 100, 1)
 
     @computed_field
-    @property
+    @cached_property
     def remaining_payments(self) -> int:
         """Estimated remaining payments based on current balance and payment."""
         if not self.monthly_payment or self.monthly_payment <= 0:
@@ -92,23 +96,24 @@ class LoanResponse(LoanBase):
 
         monthly_rate = (self.interest_rate / 100) / 12
         if monthly_rate > 0:
-            if self.monthly_payment <= self.current_balance * monthly_rate:
+            monthly_interest = self.current_balance * monthly_rate
+            if self.monthly_payment <= monthly_interest:
                 return 999  # Payment doesn't cover interest
-            n = -math.log(
-                1 - (self.current_balance * monthly_rate / self.monthly_payment)
-            ) / math.log(1 + monthly_rate)
+            n = -math.log1p(-monthly_interest / self.monthly_payment) / math.log1p(
+                monthly_rate
+            )
             return max(0, int(math.ceil(n)))
         else:
             return int(math.ceil(self.current_balance / self.monthly_payment))
 
     @computed_field
-    @property
+    @cached_property
     def total_interest_paid(self) -> float:
         """Total interest paid so far."""
         principal_paid = self.original_principal - self.current_balance
         return round(max(0, self.total_paid - principal_paid), 2)
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class LoanListResponse(BaseModel):
@@ -171,6 +176,13 @@ class LoanPaymentResponse(BaseModel):
     created_at: datetime
 
 
+class LoanPaymentListResponse(BaseModel):
+    """Response for a page of loan payments."""
+
+    payments: list[LoanPaymentResponse]
+    total: int
+
+
 class LoanSummary(BaseModel):
     """Summary of all loans for dashboard."""
 
@@ -32,7 +32,6 @@ class MonthlyTrend(BaseModel):
 
     year: int
     month: int
-    month_name: str
     income: float
     expenses: float
     net: float
@@ -53,7 +53,7 @@ class TransactionResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class TransactionListResponse(BaseModel):
@@ -1,9 +1,12 @@
 """Account service"""
 
 from typing import Optional
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime
+from functools import lru_cache
 
 import aiosqlite
+from pydantic import TypeAdapter
 
 from app.api.schemas.account import (
     AccountCreate,
@@ -16,12 +19,46 @@ from app.api.schemas.account import (
     InvestmentCreate,
 )
 
+# Account types in display order
+_ACCOUNT_TYPES = ("bank", "credit_card", "loan", "investment")
+
+# Validates a whole page of account rows in one call
+_ACCOUNTS_ADAPTER = TypeAdapter(list[AccountResponse])
+
+# Type-specific columns and how to read them off each create schema
+_ACCOUNT_EXTRA = {
+    CreditCardCreate: (
+        ("credit_limit", "interest_rate"),
+        lambda a: (a.credit_limit, a.interest_rate),
+    ),
+    LoanCreate: (
+        ("original_amount", "interest_rate", "loan_term_months", "loan_start_date"),
+        lambda a: (
+            a.original_amount,
+            a.interest_rate,
+            a.loan_term_months,
+            a.loan_start_date.isoformat() if a.loan_start_date else None,
+        ),
+    ),
+    InvestmentCreate: (
+        ("initial_investment",),
+        lambda a: (a.initial_investment,),
+    ),
+}
+_NO_ACCOUNT_EXTRA = ((), lambda a: ())
+
+# Conversions from AccountUpdate values to what the accounts table stores
+_UPDATE_COERCERS = {
+    "loan_start_date": lambda d: d.isoformat() if d else None,
+    "is_active": lambda v: 1 if v else 0,
+}
+
 
 async def create_account(
     db: aiosqlite.Connection, account: AccountCreate
 ) -> AccountResponse:
     """Create a new account."""
-    base_fields = ["name", "account_type", "current_balance", "institution", "notes"]
+    base_fields = ("name", "account_type", "current_balance", "institution", "notes")
     base_values = [
         account.name,
         account.account_type,
@@ -30,41 +67,18 @@ async def create_account(
         account.notes,
     ]
 
-    extra_fields = []
-    extra_values = []
-
-    if isinstance(account, CreditCardCreate):
-        extra_fields = ["credit_limit", "interest_rate"]
-        extra_values = [account.credit_limit, account.interest_rate]
-    elif isinstance(account, LoanCreate):
-        extra_fields = [
-            "original_amount",
-            "interest_rate",
-            "loan_term_months",
-            "loan_start_date",
-        ]
-        extra_values = [
-            account.original_amount,
-            account.interest_rate,
-            account.loan_term_months,
-            account.loan_start_date.isoformat() if account.loan_start_date else None,
-        ]
-    elif isinstance(account, InvestmentCreate):
-        extra_fields = ["initial_investment"]
-        extra_values = [account.initial_investment]
-
-    all_fields = base_fields + extra_fields
-    all_values = base_values + extra_values
-
-    placeholders = ", ".join(["?" for _ in all_fields])
-    fields_str = ", ".join(all_fields)
-
-    cursor = await db.execute(
-        f"INSERT INTO accounts ({fields_str}) VALUES ({placeholders})", all_values
+    extra_fields, get_extra_values = _ACCOUNT_EXTRA.get(
+        type(account), _NO_ACCOUNT_EXTRA
     )
+    extra_values = get_extra_values(account)
+
+    all_values = base_values + list(extra_values)
+
+    cursor = await db.execute(_build_insert_sql(base_fields + extra_fields), all_values)
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_account(db, cursor.lastrowid)
+    return _row_to_account_response(row)
 
 
 async def get_account(
@@ -77,7 +91,7 @@ async def get_account(
     if not row:
         return None
 
-    return _row_to_account_response(dict(row))
+    return _row_to_account_response(row)
 
 
 async def get_all_accounts(
@@ -99,10 +113,11 @@ async def get_all_accounts(
 
     query += " ORDER BY name"
 
-    cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
+    rows = await db.execute_fetchall(query, params)
 
-    accounts = [_row_to_account_response(dict(row)) for row in rows]
+    accounts = _ACCOUNTS_ADAPTER.validate_python(
+        [_row_to_account_dict(row) for row in rows]
+    )
 
     return AccountListResponse(accounts=accounts, total=len(accounts))
 
@@ -111,110 +126,168 @@ async def update_account(
     db: aiosqlite.Connection, account_id: int, account: AccountUpdate
 ) -> Optional[AccountResponse]:
     """Update an account."""
-    update_data = account.model_dump(exclude_unset=True)
+    # Plain attribute reads; walk fields in declaration order so the cached
+    # UPDATE statement is keyed consistently
+    fields_set = account.model_fields_set
+    update_data = {
+        key: getattr(account, key)
+        for key in AccountUpdate.model_fields
+        if key in fields_set
+    }
 
     if not update_data:
         return await get_account(db, account_id)
 
-    if "loan_start_date" in update_data and update_data["loan_start_date"]:
-        update_data["loan_start_date"] = update_data["loan_start_date"].isoformat()
-
-    if "is_active" in update_data:
-        update_data["is_active"] = 1 if update_data["is_active"] else 0
+    for key, coerce in _UPDATE_COERCERS.items():
+        if key in update_data:
+            update_data[key] = coerce(update_data[key])
 
     update_data["updated_at"] = datetime.now().isoformat()
 
-    set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
     values = list(update_data.values()) + [account_id]
 
-    await db.execute(f"UPDATE accounts SET {set_clause} WHERE id = ?", values)
+    cursor = await db.execute(_build_update_sql(tuple(update_data)), values)
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_account(db, account_id)
+    if not row:
+        return None
+
+    return _row_to_account_response(row)
 
 
 async def delete_account(db: aiosqlite.Connection, account_id: int) -> bool:
     """Delete an account."""
-    cursor = await db.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
+    cursor = await db.execute(
+        "DELETE FROM accounts WHERE id = ? RETURNING id", (account_id,)
+    )
+    row = await cursor.fetchone()
     await db.commit()
 
-    return cursor.rowcount > 0
-
-
-async def get_account_summary(db: aiosqlite.Connection) -> AccountSummary:
-    """Get a summary of all accounts for the dashboard."""
-    accounts_response = await get_all_accounts(db, is_active=True)
-    accounts = accounts_response.accounts
-
-    total_assets = 0.0
-    total_liabilities = 0.0
-    accounts_by_type: dict[str, list[AccountResponse]] = {
-        "bank": [],
-        "credit_card": [],
-        "loan": [],
-        "investment": [],
-    }
-
+    return row is not None
+
+
+async def get_account_summary(
+    db: aiosqlite.Connection, include_accounts: bool = False
+) -> AccountSummary:
+    """
+    Get a summary of all accounts for the dashboard.
+    Totals are summed by SQLite; the accounts themselves are only fetched and
+    grouped by type when include_accounts is set.
+    """
+    if not include_accounts:
+        cursor = await db.execute("""
+            SELECT
+                COALESCE(SUM(current_balance) FILTER (
+                    WHERE account_type IN ('bank', 'investment')
+                ), 0) as total_assets,
+                COALESCE(SUM(current_balance) FILTER (
+                    WHERE account_type IN ('credit_card', 'loan')
+                ), 0) as total_liabilities
+            FROM accounts
+            WHERE is_active = 1
+        """)
+        row = await cursor.fetchone()
+
+        return AccountSummary(
+            total_assets=row["total_assets"],
+            total_liabilities=row["total_liabilities"],
+            net_worth=row["total_assets"] - row["total_liabilities"],
+            accounts_by_type={},
+        )
+
+    rows = await db.execute_fetchall("""
+        SELECT
+            *,
+            COALESCE(SUM(current_balance) FILTER (
+                WHERE account_type IN ('bank', 'investment')
+            ) OVER (), 0) as total_assets,
+            COALESCE(SUM(current_balance) FILTER (
+                WHERE account_type IN ('credit_card', 'loan')
+            ) OVER (), 0) as total_liabilities
+        FROM accounts
+        WHERE is_active = 1
+        ORDER BY name
+    """)
+
+    total_assets = rows[0]["total_assets"] if rows else 0.0
+    total_liabilities = rows[0]["total_liabilities"] if rows else 0.0
+
+    accounts_by_type: defaultdict[str, list[AccountResponse]] = defaultdict(list)
+    accounts = _ACCOUNTS_ADAPTER.validate_python(
+        [_row_to_account_dict(row) for row in rows]
+    )
     for account in accounts:
         accounts_by_type[account.account_type].append(account)
 
-        if account.account_type in ("bank", "investment"):
-            total_assets += account.current_balance
-        else:
-            total_liabilities += account.current_balance
-
     return AccountSummary(
         total_assets=total_assets,
         total_liabilities=total_liabilities,
         net_worth=total_assets - total_liabilities,
-        accounts_by_type=accounts_by_type,
+        # Only types that have accounts, in the order the dashboard shows them
+        accounts_by_type={
+            account_type: accounts_by_type[account_type]
+            for account_type in _ACCOUNT_TYPES
+            if account_type in accounts_by_type
+        },
     )
 
 
-def _row_to_account_response(row: dict) -> AccountResponse:
-    """Convert a database row to an AccountResponse."""
-    from datetime import date as date_type
-
-    loan_start_date = None
-    if row.get("loan_start_date"):
-        loan_start_date = date_type.fromisoformat(row["loan_start_date"])
-
-    created_at = row.get("created_at")
-    if isinstance(created_at, str):
-        created_at = datetime.fromisoformat(created_at)
-
-    updated_at = row.get("updated_at")
-    if isinstance(updated_at, str):
-        updated_at = datetime.fromisoformat(updated_at)
-
-    available_credit = None
-    loan_paid = None
-    loan_remaining = None
-
-    if row["account_type"] == "credit_card" and row.get("credit_limit"):
-        available_credit = row["credit_limit"] - row["current_balance"]
-
-    if row["account_type"] == "loan" and row.get("original_amount"):
-        loan_paid = row["original_amount"] - row["current_balance"]
-        loan_remaining = row["current_balance"]
-
-    return AccountResponse(
-        id=row["id"],
-        name=row["name"],
-        account_type=row["account_type"],
-        current_balance=row["current_balance"],
-        credit_limit=row.get("credit_limit"),
-        original_amount=row.get("original_amount"),
-        interest_rate=row.get("interest_rate"),
-        loan_term_months=row.get("loan_term_months"),
-        loan_start_date=loan_start_date,
-        initial_investment=row.get("initial_investment"),
-        institution=row.get("institution"),
-        notes=row.get("notes"),
-        is_active=bool(row["is_active"]),
-        created_at=created_at or datetime.now(),
-        updated_at=updated_at or datetime.now(),
-        available_credit=available_credit,
-        loan_paid=loan_paid,
-        loan_remaining=loan_remaining,
+@lru_cache(maxsize=8)
+def _build_insert_sql(fields: tuple[str, ...]) -> str:
+    """Build the INSERT statement for one shape of account."""
+    placeholders = ", ".join(["?" for _ in fields])
+    return (
+        f"INSERT INTO accounts ({', '.join(fields)}) VALUES ({placeholders}) "
+        "RETURNING *"
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_update_sql(fields: tuple[str, ...]) -> str:
+    """Build the UPDATE statement for one set of changed columns."""
+    set_clause = ", ".join([f"{key} = ?" for key in fields])
+    return f"UPDATE accounts SET {set_clause} WHERE id = ? RETURNING *"
+
+
+def _row_to_account_dict(row: aiosqlite.Row) -> dict:
+    """Copy a database row and add the derived credit and loan fields."""
+    # sqlite3.Row looks names up by scanning its columns; read from the copy
+    account = dict(row)
+    account_type = account["account_type"]
+    balance = account["current_balance"]
+
+    credit_limit = account["credit_limit"]
+    account["available_credit"] = (
+        credit_limit - balance
+        if account_type == "credit_card" and credit_limit
+        else None
     )
+
+    original_amount = account["original_amount"]
+    is_loan = account_type == "loan" and original_amount
+    account["loan_paid"] = original_amount - balance if is_loan else None
+    account["loan_remaining"] = balance if is_loan else None
+
+    return account
+
+
+def _row_to_account_response(row: aiosqlite.Row) -> AccountResponse:
+    """
+    Convert a database row to an AccountResponse.
+    Rows come from our own schema, so validation is skipped.
+    """
+    account = _row_to_account_dict(row)
+
+    if loan_start_date := account["loan_start_date"]:
+        account["loan_start_date"] = date.fromisoformat(loan_start_date)
+
+    for key in ("created_at", "updated_at"):
+        value = account[key]
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        account[key] = value or datetime.now()
+
+    account["is_active"] = bool(account["is_active"])
+
+    return AccountResponse.model_construct(**account)
@@ -1,5 +1,7 @@
 """Authentication service"""
 
+import asyncio
+import hashlib
 from typing import Optional
 from datetime import datetime, timedelta, timezone
 
@@ -13,6 +15,13 @@ from app.config import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
 from app.api.schemas.auth import UserCreate, UserResponse, TokenData
+from app.api.cache import USER_CACHE, REQUEST_USERS, TOKEN_CACHE
+
+# How long a rejected token is remembered, in seconds
+INVALID_TOKEN_TTL = 5
+
+# bcrypt hash (same cost as hash_password) checked for unknown usernames
+_DUMMY_HASH = "$2b$12$p2I7xshum4x8AfoJbQ3souvupQnXWZrl81.BgLKs4pe8EtTabJbri"
 
 
 def hash_password(password: str) -> str:
@@ -48,7 +57,34 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[TokenData]:
-    """Decode and validate a JWT access token."""
+    """
+    Decode and validate a JWT access token.
+    Results are cached by a digest of the token; valid entries never outlive
+    the token's own expiry.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = TOKEN_CACHE.get(key)
+
+    if cached is False:
+        return None
+    if cached is not None:
+        return cached
+
+    token_data = _decode_jwt(token)
+
+    if token_data is None:
+        TOKEN_CACHE.set(key, False, INVALID_TOKEN_TTL)
+    elif token_data.expires_at is not None:
+        remaining = token_data.expires_at - datetime.now(timezone.utc)
+        ttl = min(TOKEN_CACHE.ttl, remaining.total_seconds())
+        if ttl > 0:
+            TOKEN_CACHE.set(key, token_data, ttl)
+
+    return token_data
+
+
+def _decode_jwt(token: str) -> Optional[TokenData]:
+    """Verify a JWT's signature and expiry and read its claims."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[TOKEN_ALGORITHM])
         username: str = payload.get("sub")
@@ -56,34 +92,54 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         if username is None:
             return None
 
-        return TokenData(username=username)
+        exp = payload.get("exp")
+        expires_at = datetime.fromtimestamp(exp, timezone.utc) if exp else None
+
+        return TokenData(username=username, expires_at=expires_at)
     except JWTError:
         return None
 
 
 async def create_user(db: aiosqlite.Connection, user: UserCreate) -> UserResponse:
     """Create a new user."""
-    hashed_password = hash_password(user.password)
+    # bcrypt is deliberately slow; keep it off the event loop
+    hashed_password = await asyncio.to_thread(hash_password, user.password)
 
     cursor = await db.execute(
-        "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+        "INSERT INTO users (username, password_hash) VALUES (?, ?) "
+        "RETURNING id, username, created_at",
         (user.username, hashed_password),
     )
+    row = await cursor.fetchone()
     await db.commit()
+    USER_CACHE.pop(user.username)
 
-    return await get_user_by_id(db, cursor.lastrowid)
+    return _row_to_user_response(row)
 
 
 async def get_user_by_username(
     db: aiosqlite.Connection, username: str
 ) -> Optional[dict]:
-    """Get a user by username (includes password hash for auth)."""
+    """
+    Get a user by username (includes password hash for auth).
+    Found users are memoized for the rest of the current request.
+    """
+    memo = REQUEST_USERS.get()
+
+    if memo is not None and username in memo:
+        return memo[username]
+
     cursor = await db.execute("SELECT * FROM users WHERE username = ?", (username,))
     row = await cursor.fetchone()
 
-    if row:
-        return dict(row)
-    return None
+    if not row:
+        return None
+
+    user = dict(row)
+    if memo is not None:
+        memo[username] = user
+
+    return user
 
 
 async def get_user_by_id(
@@ -95,18 +151,10 @@ async def get_user_by_id(
     )
     row = await cursor.fetchone()
 
-    if row:
-        row_dict = dict(row)
-        created_at = row_dict.get("created_at")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
+    if not row:
+        return None
 
-        return UserResponse(
-            id=row_dict["id"],
-            username=row_dict["username"],
-            created_at=created_at or datetime.now(),
-        )
-    return None
+    return _row_to_user_response(row)
 
 
 async def authenticate_user(
@@ -115,10 +163,12 @@ async def authenticate_user(
     """Authenticate a user and return user data if valid."""
     user = await get_user_by_username(db, username)
 
-    if not user:
-        return None
+    # Unknown users are checked against a dummy hash so they take as long
+    # as a wrong password and can't be told apart by timing
+    password_hash = user["password_hash"] if user else _DUMMY_HASH
+    valid = await asyncio.to_thread(verify_password, password, password_hash)
 
-    if not verify_password(password, user["password_hash"]):
+    if user is None or not valid:
         return None
 
     return user
@@ -126,7 +176,19 @@ async def authenticate_user(
 
 async def user_exists(db: aiosqlite.Connection) -> bool:
     """Check if any user exists (for initial setup)."""
-    cursor = await db.execute("SELECT COUNT(*) as count FROM users")
-    row = await cursor.fetchone()
+    cursor = await db.execute("SELECT 1 FROM users LIMIT 1")
+
+    return await cursor.fetchone() is not None
 
-    return row["count"] > 0
+
+def _row_to_user_response(row: aiosqlite.Row) -> UserResponse:
+    """Convert an (id, username, created_at) row to a UserResponse."""
+    created_at = row["created_at"]
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+
+    return UserResponse.model_construct(
+        id=row["id"],
+        username=row["username"],
+        created_at=created_at or datetime.now(),
+    )
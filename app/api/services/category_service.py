@@ -2,9 +2,11 @@
 
 from typing import Optional
 from datetime import datetime
+from functools import lru_cache
 
 import aiosqlite
 
+from app.api.cache import CATEGORY_CACHE
 from app.api.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
@@ -13,46 +15,71 @@ from app.api.schemas.category import (
 )
 
 
+# _row_to_category_response unpacks positionally, so queries select these in order
+_CATEGORY_COLUMNS = "id, name, type, is_system, is_active, created_at"
+
+
 async def create_category(
     db: aiosqlite.Connection, category: CategoryCreate
 ) -> CategoryResponse:
     """Create a new category."""
     cursor = await db.execute(
-        """
+        f"""
         INSERT INTO categories (name, type, is_system)
         VALUES (?, ?, 0)
+        RETURNING {_CATEGORY_COLUMNS}
         """,
         (category.name, category.type),
     )
+    row = await cursor.fetchone()
     await db.commit()
+    CATEGORY_CACHE.clear()
 
-    return await get_category(db, cursor.lastrowid)
+    return _row_to_category_response(row)
 
 
 async def get_category(
     db: aiosqlite.Connection, category_id: int
 ) -> Optional[CategoryResponse]:
     """Get a single category by ID."""
-    cursor = await db.execute("SELECT * FROM categories WHERE id = ?", (category_id,))
+    key = ("id", category_id)
+    category = CATEGORY_CACHE.get(key)
+    if category is not None:
+        return category
+
+    cursor = await db.execute(
+        f"SELECT {_CATEGORY_COLUMNS} FROM categories WHERE id = ?", (category_id,)
+    )
     row = await cursor.fetchone()
 
     if not row:
         return None
 
-    return _row_to_category_response(dict(row))
+    category = _row_to_category_response(row)
+    CATEGORY_CACHE.set(key, category)
+    return category
 
 
 async def get_category_by_name(
     db: aiosqlite.Connection, name: str
 ) -> Optional[CategoryResponse]:
     """Get a category by name."""
-    cursor = await db.execute("SELECT * FROM categories WHERE name = ?", (name,))
+    key = ("name", name)
+    category = CATEGORY_CACHE.get(key)
+    if category is not None:
+        return category
+
+    cursor = await db.execute(
+        f"SELECT {_CATEGORY_COLUMNS} FROM categories WHERE name = ?", (name,)
+    )
     row = await cursor.fetchone()
 
     if not row:
         return None
 
-    return _row_to_category_response(dict(row))
+    category = _row_to_category_response(row)
+    CATEGORY_CACHE.set(key, category)
+    return category
 
 
 async def get_all_categories(
@@ -61,25 +88,22 @@ async def get_all_categories(
     is_active: Optional[bool] = None,
 ) -> CategoryListResponse:
     """Get all categories with optional filters."""
-    query = "SELECT * FROM categories WHERE 1=1"
     params = []
 
     if category_type:
-        query += " AND type = ?"
         params.append(category_type)
 
     if is_active is not None:
-        query += " AND is_active = ?"
         params.append(1 if is_active else 0)
 
-    query += " ORDER BY type, name"
-
-    cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
+    query = _build_list_sql(bool(category_type), is_active is not None)
+    rows = await db.execute_fetchall(query, params)
 
-    categories = [_row_to_category_response(dict(row)) for row in rows]
+    categories = [_row_to_category_response(row) for row in rows]
 
-    return CategoryListResponse(categories=categories, total=len(categories))
+    return CategoryListResponse.model_construct(
+        categories=categories, total=len(categories)
+    )
 
 
 async def update_category(
@@ -97,10 +121,19 @@ async def update_category(
     set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
     values = list(update_data.values()) + [category_id]
 
-    await db.execute(f"UPDATE categories SET {set_clause} WHERE id = ?", values)
+    cursor = await db.execute(
+        f"UPDATE categories SET {set_clause} WHERE id = ? "
+        f"RETURNING {_CATEGORY_COLUMNS}",
+        values,
+    )
+    row = await cursor.fetchone()
     await db.commit()
+    CATEGORY_CACHE.clear()
+
+    if not row:
+        return None
 
-    return await get_category(db, category_id)
+    return _row_to_category_response(row)
 
 
 async def delete_category(db: aiosqlite.Connection, category_id: int) -> bool:
@@ -121,27 +154,41 @@ async def delete_category(db: aiosqlite.Connection, category_id: int) -> bool:
             "UPDATE categories SET is_active = 0 WHERE id = ?", (category_id,)
         )
         await db.commit()
+        CATEGORY_CACHE.clear()
         return True
 
     cursor = await db.execute(
         "DELETE FROM categories WHERE id = ? AND is_system = 0", (category_id,)
     )
     await db.commit()
+    CATEGORY_CACHE.clear()
 
     return cursor.rowcount > 0
 
 
-def _row_to_category_response(row: dict) -> CategoryResponse:
-    """Convert a database row to a CategoryResponse."""
-    created_at = row.get("created_at")
-    if isinstance(created_at, str):
-        created_at = datetime.fromisoformat(created_at)
+@lru_cache(maxsize=4)
+def _build_list_sql(by_type: bool, by_active: bool) -> str:
+    """Build the category list query for one combination of filters."""
+    query = f"SELECT {_CATEGORY_COLUMNS} FROM categories WHERE 1=1"
+    if by_type:
+        query += " AND type = ?"
+    if by_active:
+        query += " AND is_active = ?"
+    return query + " ORDER BY type, name"
+
 
-    return CategoryResponse(
-        id=row["id"],
-        name=row["name"],
-        type=row["type"],
-        is_system=bool(row["is_system"]),
-        is_active=bool(row["is_active"]),
-        created_at=created_at or datetime.now(),
+def _row_to_category_response(row: aiosqlite.Row) -> CategoryResponse:
+    """
+    Convert a database row (_CATEGORY_COLUMNS order) to a CategoryResponse.
+    Rows come from our own schema, so validation is skipped.
+    """
+    category_id, name, category_type, is_system, is_active, created_at = row
+
+    return CategoryResponse.model_construct(
+        id=category_id,
+        name=name,
+        type=category_type,
+        is_system=bool(is_system),
+        is_active=bool(is_active),
+        created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
     )
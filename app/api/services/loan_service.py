@@ -1,11 +1,13 @@
 """Loan service"""
 
 import math
+from calendar import monthrange
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime, date
-from dateutil.relativedelta import relativedelta
 
 import aiosqlite
+import orjson
 
 from app.api.schemas.loan import (
     LoanCreate,
@@ -16,10 +18,78 @@ from app.api.schemas.loan import (
     AmortizationSchedule,
     LoanPayment,
     LoanPaymentResponse,
+    LoanPaymentListResponse,
     LoanSummary,
 )
 
 
+# Row converters unpack positionally, so every query selects these in order
+_LOAN_COLUMNS = (
+    "id",
+    "name",
+    "loan_type",
+    "original_principal",
+    "current_balance",
+    "interest_rate",
+    "term_months",
+    "start_date",
+    "monthly_payment",
+    "total_paid",
+    "account_id",
+    "notes",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+_PAYMENT_COLUMNS = (
+    "id",
+    "loan_id",
+    "amount",
+    "principal_paid",
+    "interest_paid",
+    "extra_principal",
+    "balance_after",
+    "payment_date",
+    "notes",
+    "created_at",
+)
+
+_LOAN_SELECT = ", ".join(f"l.{column}" for column in _LOAN_COLUMNS)
+
+# Built once so every lookup sends identical text and hits the statement cache
+_GET_LOAN_SQL = f"""
+    SELECT {_LOAN_SELECT}, a.name as account_name
+    FROM loans l
+    LEFT JOIN accounts a ON l.account_id = a.id
+    WHERE l.id = ?
+"""
+
+_LIST_LOANS_SELECT = f"""
+    SELECT
+        {_LOAN_SELECT},
+        a.name as account_name,
+        SUM(l.current_balance) FILTER (WHERE l.is_active = 1) OVER ()
+            as total_balance,
+        SUM(l.original_principal) FILTER (WHERE l.is_active = 1) OVER ()
+            as total_original
+    FROM loans l
+    LEFT JOIN accounts a ON l.account_id = a.id
+"""
+_LIST_LOANS_SQL = _LIST_LOANS_SELECT + "ORDER BY l.created_at DESC"
+_LIST_LOANS_BY_ACTIVE_SQL = (
+    _LIST_LOANS_SELECT + "WHERE l.is_active = ? ORDER BY l.created_at DESC"
+)
+
+# RETURNING cannot join, so writes look the account name up per row
+_LOAN_RETURNING = (
+    ", ".join(_LOAN_COLUMNS)
+    + ", (SELECT name FROM accounts WHERE id = account_id) as account_name"
+)
+
+_PAYMENT_SELECT = ", ".join(f"p.{column}" for column in _PAYMENT_COLUMNS)
+_PAYMENT_RETURNING = ", ".join(_PAYMENT_COLUMNS)
+
+
 def calculate_monthly_payment(
     principal: float, annual_rate: float, term_months: int
 ) -> float:
@@ -39,10 +109,10 @@ def calculate_monthly_payment(
 
     monthly_rate = (annual_rate / 100) / 12
 
-    numerator = monthly_rate * math.pow(1 + monthly_rate, term_months)
-    denominator = math.pow(1 + monthly_rate, term_months) - 1
+    # (1 + r)^n - 1, computed without cancellation for small rates
+    growth = math.expm1(term_months * math.log1p(monthly_rate))
 
-    return principal * (numerator / denominator)
+    return principal * monthly_rate * (growth + 1) / growth
 
 
 def generate_amortization_schedule(
@@ -69,20 +139,64 @@ def generate_amortization_schedule(
         monthly_payment = calculate_monthly_payment(principal, annual_rate, term_months)
 
     monthly_rate = (annual_rate / 100) / 12
+
+    # Every value is computed here, so the entries skip validation
+    return [
+        AmortizationEntry.model_construct(
+            payment_number=month,
+            payment_date=_add_months(start_date, month),
+            payment_amount=round(payment_amount, 2),
+            principal=round(principal_payment, 2),
+            interest=round(interest, 2),
+            balance=round(balance, 2),
+            cumulative_interest=round(cumulative_interest, 2),
+            cumulative_principal=round(cumulative_principal, 2),
+        )
+        for month, (
+            payment_amount,
+            principal_payment,
+            interest,
+            balance,
+            cumulative_interest,
+            cumulative_principal,
+        ) in enumerate(
+            _amortize(principal, monthly_rate, term_months, monthly_payment), 1
+        )
+    ]
+
+
+def _add_months(start: date, months: int) -> date:
+    """Shift a date forward by whole months, clamping to the month's last day."""
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    month += 1
+    return date(year, month, min(start.day, monthrange(year, month)[1]))
+
+
+def _amortize(
+    principal: float, monthly_rate: float, term_months: int, monthly_payment: float
+) -> list[tuple[float, float, float, float, float, float]]:
+    """
+    Numeric core of the amortization schedule.
+
+    Returns one (payment, principal, interest, balance, cumulative interest,
+    cumulative principal) tuple per month, unrounded. Kept to plain float
+    arithmetic on locals so the loop stays cheap for long terms.
+    """
+    rows = []
+    append = rows.append
     balance = principal
-    schedule = []
-    cumulative_interest = 0
-    cumulative_principal = 0
+    cumulative_interest = 0.0
+    cumulative_principal = 0.0
 
     for month in range(1, term_months + 1):
-        payment_date = start_date + relativedelta(months=month)
-
         interest = balance * monthly_rate
 
-        principal_payment = min(monthly_payment - interest, balance)
-
+        principal_payment = monthly_payment - interest
+        if principal_payment > balance:
+            principal_payment = balance
         if principal_payment < 0:
-            principal_payment = 0
+            principal_payment = 0.0
 
         if month == term_months or balance - principal_payment < 0.01:
             principal_payment = balance
@@ -90,28 +204,28 @@ def generate_amortization_schedule(
         else:
             payment_amount = monthly_payment
 
-        balance = max(0, balance - principal_payment)
+        balance -= principal_payment
+        if balance < 0:
+            balance = 0.0
 
         cumulative_interest += interest
         cumulative_principal += principal_payment
 
-        schedule.append(
-            AmortizationEntry(
-                payment_number=month,
-                payment_date=payment_date,
-                payment_amount=round(payment_amount, 2),
-                principal=round(principal_payment, 2),
-                interest=round(interest, 2),
-                balance=round(balance, 2),
-                cumulative_interest=round(cumulative_interest, 2),
-                cumulative_principal=round(cumulative_principal, 2),
+        append(
+            (
+                payment_amount,
+                principal_payment,
+                interest,
+                balance,
+                cumulative_interest,
+                cumulative_principal,
             )
         )
 
         if balance <= 0:
             break
 
-    return schedule
+    return rows
 
 
 async def create_loan(db: aiosqlite.Connection, loan: LoanCreate) -> LoanResponse:
@@ -124,19 +238,21 @@ async def create_loan(db: aiosqlite.Connection, loan: LoanCreate) -> LoanRespons
         )
 
     cursor = await db.execute(
-        """
+        f"""
         INSERT INTO loans (
             name, loan_type, original_principal, current_balance,
             interest_rate, term_months, start_date, monthly_payment,
             account_id, notes
         )
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        RETURNING {_LOAN_RETURNING}
         """,
         (
             loan.name,
             loan.loan_type,
             loan.original_principal,
             loan.original_principal,
+            loan.interest_rate,
             loan.term_months,
             loan.start_date.isoformat(),
             round(monthly_payment, 2),
@@ -144,61 +260,41 @@ async def create_loan(db: aiosqlite.Connection, loan: LoanCreate) -> LoanRespons
             loan.notes,
         ),
     )
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_loan(db, cursor.lastrowid)
+    return _row_to_loan_response(row)
 
 
 async def get_loan(db: aiosqlite.Connection, loan_id: int) -> Optional[LoanResponse]:
     """Get a single loan by ID."""
-    cursor = await db.execute(
-        """
-        SELECT 
-            l.*,
-            a.name as account_name
-        FROM loans l
-        LEFT JOIN accounts a ON l.account_id = a.id
-        WHERE l.id = ?
-        """,
-        (loan_id,),
-    )
+    cursor = await db.execute(_GET_LOAN_SQL, (loan_id,))
     row = await cursor.fetchone()
 
     if not row:
         return None
 
-    return _row_to_loan_response(dict(row))
+    return _row_to_loan_response(row)
 
 
 async def get_all_loans(
     db: aiosqlite.Connection, is_active: Optional[bool] = None
 ) -> LoanListResponse:
     """Get all loans with optional active filter."""
-    query = """
-        SELECT 
-            l.*,
-            a.name as account_name
-        FROM loans l
-        LEFT JOIN accounts a ON l.account_id = a.id
-        WHERE 1=1
-    """
-    params = []
-
-    if is_active is not None:
-        query += " AND l.is_active = ?"
-        params.append(1 if is_active else 0)
-
-    query += " ORDER BY l.created_at DESC"
-
-    cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
+    if is_active is None:
+        rows = await db.execute_fetchall(_LIST_LOANS_SQL)
+    else:
+        rows = await db.execute_fetchall(
+            _LIST_LOANS_BY_ACTIVE_SQL, (1 if is_active else 0,)
+        )
 
-    loans = [_row_to_loan_response(dict(row)) for row in rows]
+    loans = [_row_to_loan_response(row) for row in rows]
 
-    total_balance = sum(loan.current_balance for loan in loans if loan.is_active)
-    total_original = sum(loan.original_principal for loan in loans if loan.is_active)
+    # Every row carries the same window totals
+    total_balance = (rows[0]["total_balance"] or 0) if rows else 0
+    total_original = (rows[0]["total_original"] or 0) if rows else 0
 
-    return LoanListResponse(
+    return LoanListResponse.model_construct(
         loans=loans,
         total=len(loans),
         total_balance=round(total_balance, 2),
@@ -212,34 +308,31 @@ async def get_loan_summary(db: aiosqlite.Connection) -> LoanSummary:
         """
         SELECT 
             COUNT(*) as total,
-            SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END) as active,
-            SUM(CASE WHEN is_active = 1 THEN current_balance ELSE 0 END) as total_balance,
-            SUM(CASE WHEN is_active = 1 THEN original_principal ELSE 0 END) as total_original,
-            SUM(CASE WHEN is_active = 1 THEN monthly_payment ELSE 0 END) as total_monthly
+            COUNT(*) FILTER (WHERE is_active = 1) as active,
+            TOTAL(CASE WHEN is_active = 1 THEN current_balance END) as total_balance,
+            TOTAL(CASE WHEN is_active = 1 THEN original_principal END) as total_original,
+            TOTAL(CASE WHEN is_active = 1 THEN monthly_payment END) as total_monthly,
+            (
+                SELECT json_group_object(loan_type, count)
+                FROM (
+                    SELECT loan_type, COUNT(*) as count
+                    FROM loans
+                    WHERE is_active = 1
+                    GROUP BY loan_type
+                )
+            ) as loans_by_type
         FROM loans
         """
     )
     row = await cursor.fetchone()
-    row_dict = dict(row)
-
-    cursor = await db.execute(
-        """
-        SELECT loan_type, COUNT(*) as count
-        FROM loans
-        WHERE is_active = 1
-        GROUP BY loan_type
-        """
-    )
-    type_rows = await cursor.fetchall()
-    loans_by_type = {r["loan_type"]: r["count"] for r in type_rows}
 
     return LoanSummary(
-        total_loans=row_dict["total"] or 0,
-        active_loans=row_dict["active"] or 0,
-        total_balance=row_dict["total_balance"] or 0,
-        total_original=row_dict["total_original"] or 0,
-        total_monthly_payment=row_dict["total_monthly"] or 0,
-        loans_by_type=loans_by_type,
+        total_loans=row["total"],
+        active_loans=row["active"],
+        total_balance=row["total_balance"],
+        total_original=row["total_original"],
+        total_monthly_payment=row["total_monthly"],
+        loans_by_type=orjson.loads(row["loans_by_type"]),
     )
 
 
@@ -289,13 +382,16 @@ async def update_loan(
 
     update_data["updated_at"] = datetime.now().isoformat()
 
-    set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
     values = list(update_data.values()) + [loan_id]
 
-    await db.execute(f"UPDATE loans SET {set_clause} WHERE id = ?", values)
+    cursor = await db.execute(_build_update_sql(tuple(update_data)), values)
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_loan(db, loan_id)
+    if not row:
+        return None
+
+    return _row_to_loan_response(row)
 
 
 async def delete_loan(db: aiosqlite.Connection, loan_id: int) -> bool:
@@ -311,46 +407,58 @@ async def record_payment(
 ) -> Optional[LoanPaymentResponse]:
     """
     Record a loan payment and update the loan balance.
+    The interest/principal split is computed from the loan row inside the
+    INSERT, so a missing loan simply inserts nothing.
     """
-    loan = await get_loan(db, loan_id)
-    if not loan:
-        return None
-
-    monthly_rate = (loan.interest_rate / 100) / 12
-    interest_portion = loan.current_balance * monthly_rate
-
-    base_principal = payment.amount - interest_portion
-    total_principal = base_principal + payment.extra_principal
-
-    if total_principal > loan.current_balance:
-        total_principal = loan.current_balance
-        interest_portion = payment.amount - total_principal
-
-    new_balance = max(0, loan.current_balance - total_principal)
+    total_payment = payment.amount + payment.extra_principal
 
     cursor = await db.execute(
-        """
+        f"""
         INSERT INTO loan_payments (
             loan_id, amount, principal_paid, interest_paid,
             extra_principal, balance_after, payment_date, notes
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        SELECT
+            id,
+            :total,
+            ROUND(MIN(principal, current_balance), 2),
+            ROUND(
+                CASE WHEN principal > current_balance
+                    THEN :amount - current_balance
+                    ELSE interest
+                END, 2
+            ),
+            :extra,
+            ROUND(MAX(current_balance - MIN(principal, current_balance), 0), 2),
+            :payment_date,
+            :notes
+        FROM (
+            SELECT
+                id,
+                current_balance,
+                current_balance * ((interest_rate / 100.0) / 12) as interest,
+                :amount - current_balance * ((interest_rate / 100.0) / 12) + :extra
+                    as principal
+            FROM loans
+            WHERE id = :loan_id
+        )
+        RETURNING {_PAYMENT_RETURNING}
         """,
-        (
-            loan_id,
-            payment.amount + payment.extra_principal,
-            round(total_principal, 2),
-            round(interest_portion, 2),
-            payment.extra_principal,
-            round(new_balance, 2),
-            payment.payment_date.isoformat(),
-            payment.notes,
-        ),
+        {
+            "loan_id": loan_id,
+            "total": total_payment,
+            "amount": payment.amount,
+            "extra": payment.extra_principal,
+            "payment_date": payment.payment_date.isoformat(),
+            "notes": payment.notes,
+        },
     )
-    payment_id = cursor.lastrowid
+    row = await cursor.fetchone()
 
-    total_payment = payment.amount + payment.extra_principal
-    is_active = 1 if new_balance > 0.01 else 0
+    if not row:
+        return None
+
+    new_balance = row["balance_after"]
 
     await db.execute(
         """
@@ -362,102 +470,146 @@ async def record_payment(
         WHERE id = ?
         """,
         (
-            round(new_balance, 2),
+            new_balance,
             round(total_payment, 2),
-            is_active,
+            1 if new_balance > 0.01 else 0,
             datetime.now().isoformat(),
             loan_id,
         ),
     )
     await db.commit()
 
-    cursor = await db.execute("SELECT * FROM loan_payments WHERE id = ?", (payment_id,))
-    row = await cursor.fetchone()
-    row_dict = dict(row)
-
-    return LoanPaymentResponse(
-        id=row_dict["id"],
-        loan_id=row_dict["loan_id"],
-        amount=row_dict["amount"],
-        principal_paid=row_dict["principal_paid"],
-        interest_paid=row_dict["interest_paid"],
-        extra_principal=row_dict["extra_principal"],
-        new_balance=row_dict["balance_after"],
-        payment_date=date.fromisoformat(row_dict["payment_date"]),
-        notes=row_dict.get("notes"),
-        created_at=datetime.fromisoformat(row_dict["created_at"])
-        if row_dict.get("created_at")
-        else datetime.now(),
-    )
+    return _row_to_payment_response(row)
 
 
 async def get_loan_payments(
-    db: aiosqlite.Connection, loan_id: int, limit: int = 50
-) -> list[LoanPaymentResponse]:
-    """Get payment history for a loan."""
-    cursor = await db.execute(
-        """
-        SELECT * FROM loan_payments
-        WHERE loan_id = ?
-        ORDER BY payment_date DESC, id DESC
-        LIMIT ?
+    db: aiosqlite.Connection, loan_id: int, limit: int = 50, offset: int = 0
+) -> Optional[LoanPaymentListResponse]:
+    """
+    Get a page of payment history for a loan, newest first.
+    Returns None if the loan does not exist.
+    """
+    # Joining from loans yields one all-NULL row for a loan with no payments
+    # and no rows at all for a missing loan
+    rows = await db.execute_fetchall(
+        f"""
+        SELECT {_PAYMENT_SELECT}, COUNT(p.id) OVER () as total
+        FROM loans l
+        LEFT JOIN loan_payments p ON p.loan_id = l.id
+        WHERE l.id = ?
+        ORDER BY p.payment_date DESC, p.id DESC
+        LIMIT ? OFFSET ?
         """,
-        (loan_id, limit),
+        (loan_id, limit, offset),
     )
-    rows = await cursor.fetchall()
-
-    payments = []
-    for row in rows:
-        row_dict = dict(row)
-        payments.append(
-            LoanPaymentResponse(
-                id=row_dict["id"],
-                loan_id=row_dict["loan_id"],
-                amount=row_dict["amount"],
-                principal_paid=row_dict["principal_paid"],
-                interest_paid=row_dict["interest_paid"],
-                extra_principal=row_dict["extra_principal"],
-                new_balance=row_dict["balance_after"],
-                payment_date=date.fromisoformat(row_dict["payment_date"]),
-                notes=row_dict.get("notes"),
-                created_at=datetime.fromisoformat(row_dict["created_at"])
-                if row_dict.get("created_at")
-                else datetime.now(),
-            )
+
+    if rows:
+        total = rows[0]["total"]
+    elif offset:
+        # Paged past the end, so there is no row to read the total from
+        cursor = await db.execute(
+            """
+            SELECT COUNT(p.id) FROM loans l
+            LEFT JOIN loan_payments p ON p.loan_id = l.id
+            WHERE l.id = ?
+            GROUP BY l.id
+            """,
+            (loan_id,),
         )
+        total_row = await cursor.fetchone()
+        if not total_row:
+            return None
+        total = total_row[0]
+    else:
+        return None
+
+    return LoanPaymentListResponse.model_construct(
+        payments=[_row_to_payment_response(row) for row in rows if row[0] is not None],
+        total=total,
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_update_sql(fields: tuple[str, ...]) -> str:
+    """Build the UPDATE statement for one set of changed columns."""
+    set_clause = ", ".join([f"{key} = ?" for key in fields])
+    return f"UPDATE loans SET {set_clause} WHERE id = ? RETURNING {_LOAN_RETURNING}"
 
-    return payments
-
-
-def _row_to_loan_response(row: dict) -> LoanResponse:
-    """Convert a database row to a LoanResponse."""
-    start_date = row.get("start_date")
-    if isinstance(start_date, str):
-        start_date = date.fromisoformat(start_date)
-
-    created_at = row.get("created_at")
-    if isinstance(created_at, str):
-        created_at = datetime.fromisoformat(created_at)
-
-    updated_at = row.get("updated_at")
-    if isinstance(updated_at, str):
-        updated_at = datetime.fromisoformat(updated_at)
-
-    return LoanResponse(
-        id=row["id"],
-        name=row["name"],
-        loan_type=row["loan_type"],
-        original_principal=row["original_principal"],
-        current_balance=row["current_balance"],
-        interest_rate=row["interest_rate"],
-        term_months=row["term_months"],
-        start_date=start_date,
-        monthly_payment=row.get("monthly_payment"),
-        total_paid=row.get("total_paid", 0),
-        account_id=row.get("account_id"),
-        account_name=row.get("account_name"),
-        notes=row.get("notes"),
-        is_active=bool(row["is_active"]),
-        created_at=created_at or datetime.now(),
-        updated_at=updated_at or datetime.now(),
+
+def _row_to_payment_response(row: aiosqlite.Row) -> LoanPaymentResponse:
+    """
+    Convert a loan_payments row (_PAYMENT_COLUMNS order, then anything
+    extra) to a response.
+    Rows come from our own schema, so validation is skipped.
+    """
+    (
+        payment_id,
+        loan_id,
+        amount,
+        principal_paid,
+        interest_paid,
+        extra_principal,
+        balance_after,
+        payment_date,
+        notes,
+        created_at,
+        *_,
+    ) = row
+
+    return LoanPaymentResponse.model_construct(
+        id=payment_id,
+        loan_id=loan_id,
+        amount=amount,
+        principal_paid=principal_paid,
+        interest_paid=interest_paid,
+        extra_principal=extra_principal,
+        new_balance=balance_after,
+        payment_date=date.fromisoformat(payment_date),
+        notes=notes,
+        created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+    )
+
+
+def _row_to_loan_response(row: aiosqlite.Row) -> LoanResponse:
+    """
+    Convert a loan row (_LOAN_COLUMNS order, then account_name) to a response.
+    Rows come from our own schema, so validation is skipped.
+    """
+    (
+        loan_id,
+        name,
+        loan_type,
+        original_principal,
+        current_balance,
+        interest_rate,
+        term_months,
+        start_date,
+        monthly_payment,
+        total_paid,
+        account_id,
+        notes,
+        is_active,
+        created_at,
+        updated_at,
+        account_name,
+        *_,
+    ) = row
+
+    return LoanResponse.model_construct(
+        id=loan_id,
+        name=name,
+        loan_type=loan_type,
+        original_principal=original_principal,
+        current_balance=current_balance,
+        interest_rate=interest_rate,
+        term_months=term_months,
+        start_date=date.fromisoformat(start_date),
+        monthly_payment=monthly_payment,
+        total_paid=total_paid,
+        account_id=account_id,
+        account_name=account_name,
+        notes=notes,
+        is_active=bool(is_active),
+        created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+        updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
     )
@@ -1,8 +1,9 @@
 """Report service"""
 
 import io
-import csv
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import Optional, AsyncIterator, Callable
 from datetime import date
 from dateutil.relativedelta import relativedelta
 
@@ -18,21 +19,172 @@ from app.api.schemas.report import (
 )
 
 
-MONTH_NAMES = [
-    "",
-    "January",
-    "February",
-    "March",
-    "April",
-    "May",
-    "June",
-    "July",
-    "August",
-    "September",
-    "October",
-    "November",
-    "December",
-]
+# Buffered CSV text is flushed to the client once it grows past this many characters
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Characters that force a CSV field to be quoted
+_CSV_NEEDS_QUOTES = re.compile(r'[,"\r\n]')
+
+# One row per month end over the requested window, oldest first. A point is
+# rebuilt from today's balances by undoing everything dated in later months;
+# the current month is never undone so its point equals today's balances.
+# Activity is summed once per account (or loan) and month, then each point's
+# undo is a running total over the months after it.
+_NET_WORTH_HISTORY_SQL = """
+    WITH RECURSIVE month_ends(month_end) AS (
+        SELECT date(:today, 'start of month', :first_month, '+1 month', '-1 day')
+        UNION ALL
+        SELECT date(month_end, '+1 day', '+1 month', '-1 day')
+        FROM month_ends
+        WHERE month_end < :today
+    ),
+    points AS (
+        SELECT
+            MIN(month_end, :today) as point_date,
+            strftime('%Y-%m', month_end) as month
+        FROM month_ends
+    ),
+    effects AS (
+        SELECT account_id, date, amount FROM transactions
+        WHERE date > (SELECT MIN(month_end) FROM month_ends)
+        UNION ALL
+        SELECT transfer_to_account_id, date, -amount FROM transactions
+        WHERE date > (SELECT MIN(month_end) FROM month_ends)
+            AND transfer_to_account_id IS NOT NULL
+    ),
+    monthly_effects AS (
+        SELECT
+            account_id,
+            MIN(strftime('%Y-%m', date), strftime('%Y-%m', :today)) as month,
+            SUM(amount) as amount
+        FROM effects
+        GROUP BY account_id, month
+    ),
+    account_balances AS (
+        SELECT
+            p.point_date,
+            a.account_type,
+            a.current_balance - COALESCE(SUM(me.amount) OVER (
+                PARTITION BY a.id ORDER BY p.point_date DESC
+                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ), 0) as balance
+        FROM points p
+        CROSS JOIN accounts a
+        LEFT JOIN monthly_effects me ON me.account_id = a.id AND me.month = p.month
+        WHERE a.is_active = 1
+    ),
+    monthly_principal AS (
+        SELECT
+            loan_id,
+            MIN(strftime('%Y-%m', payment_date), strftime('%Y-%m', :today))
+                as month,
+            SUM(principal_paid) as principal_paid
+        FROM loan_payments
+        WHERE payment_date > (SELECT MIN(month_end) FROM month_ends)
+        GROUP BY loan_id, month
+    ),
+    loan_balances AS (
+        SELECT
+            p.point_date,
+            l.start_date,
+            l.current_balance + COALESCE(SUM(mp.principal_paid) OVER (
+                PARTITION BY l.id ORDER BY p.point_date DESC
+                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ), 0) as balance
+        FROM points p
+        CROSS JOIN loans l
+        LEFT JOIN monthly_principal mp ON mp.loan_id = l.id AND mp.month = p.month
+        WHERE l.is_active = 1
+    ),
+    loan_totals AS (
+        SELECT point_date, SUM(balance) as balance
+        FROM loan_balances
+        WHERE start_date <= point_date
+        GROUP BY point_date
+    ),
+    account_totals AS (
+        SELECT
+            point_date,
+            TOTAL(balance) FILTER (
+                WHERE account_type IN ('bank', 'investment')
+            ) as assets,
+            TOTAL(ABS(balance)) FILTER (
+                WHERE account_type IN ('credit_card', 'loan')
+            ) as liabilities
+        FROM account_balances
+        GROUP BY point_date
+    )
+    SELECT
+        p.point_date,
+        COALESCE(at.assets, 0) as assets,
+        COALESCE(at.liabilities, 0) + COALESCE(lt.balance, 0) as liabilities
+    FROM points p
+    LEFT JOIN account_totals at ON at.point_date = p.point_date
+    LEFT JOIN loan_totals lt ON lt.point_date = p.point_date
+    ORDER BY p.point_date
+"""
+
+
+def _spending_by_category_sql(by_account: bool) -> str:
+    """
+    Build the category report query. Income is summed across all groups in
+    the same pass; groups with no spending are dropped by the caller.
+    """
+    account_filter = " AND t.account_id = ?" if by_account else ""
+    return f"""
+        SELECT 
+            c.id as category_id,
+            COALESCE(c.name, 'Uncategorized') as category_name,
+            SUM(ABS(t.amount)) FILTER (WHERE t.amount < 0) as total,
+            COUNT(*) FILTER (WHERE t.amount < 0) as count,
+            TOTAL(SUM(ABS(t.amount)) FILTER (WHERE t.amount < 0)) OVER ()
+                as total_spending,
+            TOTAL(SUM(t.amount) FILTER (WHERE t.amount > 0)) OVER ()
+                as total_income
+        FROM transactions t
+        LEFT JOIN categories c ON t.category_id = c.id
+        WHERE t.date >= ?
+            AND t.date <= ?
+            AND t.transfer_to_account_id IS NULL{account_filter}
+        GROUP BY c.id, c.name ORDER BY total DESC
+    """
+
+
+# Keyed by whether the report is filtered to one account
+_SPENDING_BY_CATEGORY_SQL = {
+    by_account: _spending_by_category_sql(by_account) for by_account in (False, True)
+}
+
+
+def _spending_trends_sql(by_account: bool) -> str:
+    """Build the monthly trends query, averaging the months in the same pass."""
+    account_filter = " AND t.account_id = ?" if by_account else ""
+    income = (
+        "SUM(CASE WHEN t.amount > 0 AND t.transfer_to_account_id IS NULL "
+        "THEN t.amount ELSE 0 END)"
+    )
+    expenses = (
+        "SUM(CASE WHEN t.amount < 0 AND t.transfer_to_account_id IS NULL "
+        "THEN ABS(t.amount) ELSE 0 END)"
+    )
+    return f"""
+        SELECT 
+            CAST(strftime('%Y', t.date) AS INTEGER) as year,
+            CAST(strftime('%m', t.date) AS INTEGER) as month,
+            {income} as income,
+            {expenses} as expenses,
+            AVG({income}) OVER () as average_income,
+            AVG({expenses}) OVER () as average_expenses
+        FROM transactions t
+        WHERE t.date >= ?{account_filter}
+        GROUP BY year, month ORDER BY year, month
+    """
+
+
+# Keyed by whether the trends are filtered to one account
+_SPENDING_TRENDS_SQL = {
+    by_account: _spending_trends_sql(by_account) for by_account in (False, True)
+}
 
 
 async def get_spending_by_category(
@@ -44,34 +196,22 @@ async def get_spending_by_category(
     """
     Get spending breakdown by category for a date range.
     """
-    query = """
-        SELECT 
-            c.id as category_id,
-            COALESCE(c.name, 'Uncategorized') as category_name,
-            SUM(ABS(t.amount)) as total,
-            COUNT(*) as count
-        FROM transactions t
-        LEFT JOIN categories c ON t.category_id = c.id
-        WHERE t.amount < 0
-            AND t.date >= ?
-            AND t.date <= ?
-            AND t.transfer_to_account_id IS NULL
-    """
     params = [start_date.isoformat(), end_date.isoformat()]
-
     if account_id:
-        query += " AND t.account_id = ?"
         params.append(account_id)
 
-    query += " GROUP BY c.id, c.name ORDER BY total DESC"
-
-    cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
+    rows = await db.execute_fetchall(
+        _SPENDING_BY_CATEGORY_SQL[bool(account_id)], params
+    )
 
-    total_spending = sum(row["total"] for row in rows)
+    total_spending = rows[0]["total_spending"] if rows else 0
+    total_income = rows[0]["total_income"] if rows else 0
 
     categories = []
     for row in rows:
+        if not row["count"]:
+            continue
+
         percent = (row["total"] / total_spending * 100) if total_spending > 0 else 0
         categories.append(
             CategorySpending(
@@ -83,23 +223,6 @@ async def get_spending_by_category(
             )
         )
 
-    income_query = """
-        SELECT COALESCE(SUM(t.amount), 0) as total
-        FROM transactions t
-        WHERE t.amount > 0
-            AND t.date >= ?
-            AND t.date <= ?
-            AND t.transfer_to_account_id IS NULL
-    """
-    income_params = [start_date.isoformat(), end_date.isoformat()]
-    if account_id:
-        income_query += " AND t.account_id = ?"
-        income_params.append(account_id)
-
-    cursor = await db.execute(income_query, income_params)
-    income_row = await cursor.fetchone()
-    total_income = income_row["total"] or 0
-
     return SpendingByCategory(
         start_date=start_date,
         end_date=end_date,
@@ -121,55 +244,31 @@ async def get_spending_trends(
     today = date.today()
     start_date = (today - relativedelta(months=months - 1)).replace(day=1)
 
-    query = """
-        SELECT 
-            strftime('%Y', t.date) as year,
-            strftime('%m', t.date) as month,
-            SUM(CASE WHEN t.amount > 0 AND t.transfer_to_account_id IS NULL THEN t.amount ELSE 0 END) as income,
-            SUM(CASE WHEN t.amount < 0 AND t.transfer_to_account_id IS NULL THEN ABS(t.amount) ELSE 0 END) as expenses
-        FROM transactions t
-        WHERE t.date >= ?
-    """
     params = [start_date.isoformat()]
-
     if account_id:
-        query += " AND t.account_id = ?"
         params.append(account_id)
 
-    query += " GROUP BY year, month ORDER BY year, month"
-
-    cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
+    rows = await db.execute_fetchall(_SPENDING_TRENDS_SQL[bool(account_id)], params)
 
-    monthly_data = []
-    for row in rows:
-        year = int(row["year"])
-        month = int(row["month"])
-        income = row["income"] or 0
-        expenses = row["expenses"] or 0
-
-        monthly_data.append(
-            MonthlyTrend(
-                year=year,
-                month=month,
-                month_name=MONTH_NAMES[month],
-                income=round(income, 2),
-                expenses=round(expenses, 2),
-                net=round(income - expenses, 2),
-            )
+    monthly_data = [
+        MonthlyTrend(
+            year=year,
+            month=month,
+            income=round(income, 2),
+            expenses=round(expenses, 2),
+            net=round(income - expenses, 2),
         )
+        for year, month, income, expenses, _, _ in rows
+    ]
 
-    if monthly_data:
-        avg_income = sum(m.income for m in monthly_data) / len(monthly_data)
-        avg_expenses = sum(m.expenses for m in monthly_data) / len(monthly_data)
-    else:
-        avg_income = 0
-        avg_expenses = 0
+    # Every row carries the same window averages
+    average_income = rows[0]["average_income"] if rows else 0
+    average_expenses = rows[0]["average_expenses"] if rows else 0
 
     return SpendingTrends(
         months=monthly_data,
-        average_income=round(avg_income, 2),
-        average_expenses=round(avg_expenses, 2),
+        average_income=round(average_income, 2),
+        average_expenses=round(average_expenses, 2),
     )
 
 
@@ -179,46 +278,35 @@ async def get_net_worth_history(
 ) -> NetWorthHistory:
     """
     Get net worth history over time.
-    """
-    cursor = await db.execute("""
-        SELECT 
-            SUM(CASE WHEN account_type IN ('bank', 'investment') THEN current_balance ELSE 0 END) as assets,
-            SUM(CASE WHEN account_type IN ('credit_card', 'loan') THEN ABS(current_balance) ELSE 0 END) as liabilities
-        FROM accounts
-        WHERE is_active = 1
-    """)
-    row = await cursor.fetchone()
-    current_assets = row["assets"] or 0
-    current_liabilities = row["liabilities"] or 0
-    current_net_worth = current_assets - current_liabilities
 
-    cursor = await db.execute("""
-        SELECT COALESCE(SUM(current_balance), 0) as total
-        FROM loans
-        WHERE is_active = 1
-    """)
-    loan_row = await cursor.fetchone()
-    loan_balance = loan_row["total"] or 0
-    current_liabilities += loan_balance
-    current_net_worth = current_assets - current_liabilities
+    Each month-end balance is rebuilt from today's balances by undoing the
+    transactions and loan payments dated after it. The last point is today
+    and matches the current balances exactly.
+    """
+    today = date.today().isoformat()
 
-    today = date.today()
+    rows = await db.execute_fetchall(
+        _NET_WORTH_HISTORY_SQL,
+        {"today": today, "first_month": f"-{months - 1} months"},
+    )
 
     history = [
         NetWorthDataPoint(
-            date=today,
-            assets=round(current_assets, 2),
-            liabilities=round(current_liabilities, 2),
-            net_worth=round(current_net_worth, 2),
+            date=date.fromisoformat(point_date),
+            assets=round(assets, 2),
+            liabilities=round(liabilities, 2),
+            net_worth=round(assets - liabilities, 2),
         )
+        for point_date, assets, liabilities in rows
     ]
 
-    change_amount = 0
-    change_percent = 0
+    first, current = history[0].net_worth, history[-1].net_worth
+    change_amount = current - first
+    change_percent = change_amount / abs(first) * 100 if first else 0
 
     return NetWorthHistory(
         history=history,
-        current_net_worth=round(current_net_worth, 2),
+        current_net_worth=current,
         change_amount=round(change_amount, 2),
         change_percent=round(change_percent, 1),
     )
@@ -230,83 +318,63 @@ async def export_transactions_csv(
     end_date: Optional[date] = None,
     account_id: Optional[int] = None,
     category_id: Optional[int] = None,
-) -> str:
+) -> AsyncIterator[str]:
     """
     Export transactions to CSV format.
-    """
-    query = """
-        SELECT 
-            t.date,
-            t.amount,
-            t.description,
-            t.payee,
-            a.name as account_name,
-            c.name as category_name,
-            ta.name as transfer_to,
-            t.notes
-        FROM transactions t
-        LEFT JOIN accounts a ON t.account_id = a.id
-        LEFT JOIN categories c ON t.category_id = c.id
-        LEFT JOIN accounts ta ON t.transfer_to_account_id = ta.id
-        WHERE 1=1
+    Yields the file in chunks as rows are read from the database.
     """
     params = []
 
     if start_date:
-        query += " AND t.date >= ?"
         params.append(start_date.isoformat())
 
     if end_date:
-        query += " AND t.date <= ?"
         params.append(end_date.isoformat())
 
     if account_id:
-        query += " AND (t.account_id = ? OR t.transfer_to_account_id = ?)"
         params.extend([account_id, account_id])
 
     if category_id:
-        query += " AND t.category_id = ?"
         params.append(category_id)
 
-    query += " ORDER BY t.date DESC, t.id DESC"
-
+    query = _build_export_transactions_sql(
+        bool(start_date), bool(end_date), bool(account_id), bool(category_id)
+    )
     cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow(
-        [
-            "Date",
-            "Amount",
-            "Description",
-            "Payee",
-            "Account",
-            "Category",
-            "Transfer To",
-            "Notes",
-        ]
-    )
+    header = [
+        "Date",
+        "Amount",
+        "Description",
+        "Payee",
+        "Account",
+        "Category",
+        "Transfer To",
+        "Notes",
+    ]
 
-    for row in rows:
-        writer.writerow(
-            [
-                row["date"],
-                row["amount"],
-                row["description"] or "",
-                row["payee"] or "",
-                row["account_name"] or "",
-                row["category_name"] or "",
-                row["transfer_to"] or "",
-                row["notes"] or "",
-            ]
+    def to_line(row):
+        (
+            tx_date,
+            amount,
+            description,
+            payee,
+            account_name,
+            category_name,
+            transfer_to,
+            notes,
+        ) = row
+        return (
+            f"{tx_date},{amount},{_csv_text(description)},{_csv_text(payee)},"
+            f"{_csv_text(account_name)},{_csv_text(category_name)},"
+            f"{_csv_text(transfer_to)},{_csv_text(notes)}\r\n"
         )
 
-    return output.getvalue()
+    async for chunk in _stream_csv(cursor, header, to_line):
+        yield chunk
 
 
-async def export_accounts_csv(db: aiosqlite.Connection) -> str:
+async def export_accounts_csv(db: aiosqlite.Connection) -> AsyncIterator[str]:
     """Export accounts to CSV format."""
     cursor = await db.execute("""
         SELECT 
@@ -315,42 +383,40 @@ async def export_accounts_csv(db: aiosqlite.Connection) -> str:
         FROM accounts
         ORDER BY account_type, name
     """)
-    rows = await cursor.fetchall()
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow(
-        [
-            "Name",
-            "Type",
-            "Balance",
-            "Credit Limit",
-            "Interest Rate",
-            "Institution",
-            "Notes",
-            "Active",
-        ]
-    )
+    header = [
+        "Name",
+        "Type",
+        "Balance",
+        "Credit Limit",
+        "Interest Rate",
+        "Institution",
+        "Notes",
+        "Active",
+    ]
 
-    for row in rows:
-        writer.writerow(
-            [
-                row["name"],
-                row["account_type"],
-                row["current_balance"],
-                row["credit_limit"] or "",
-                row["interest_rate"] or "",
-                row["institution"] or "",
-                row["notes"] or "",
-                "Yes" if row["is_active"] else "No",
-            ]
+    def to_line(row):
+        (
+            name,
+            account_type,
+            current_balance,
+            credit_limit,
+            interest_rate,
+            institution,
+            notes,
+            is_active,
+        ) = row
+        return (
+            f"{_csv_text(name)},{account_type},{current_balance},"
+            f"{credit_limit or ''},{interest_rate or ''},{_csv_text(institution)},"
+            f"{_csv_text(notes)},{'Yes' if is_active else 'No'}\r\n"
         )
 
-    return output.getvalue()
+    async for chunk in _stream_csv(cursor, header, to_line):
+        yield chunk
 
 
-async def export_subscriptions_csv(db: aiosqlite.Connection) -> str:
+async def export_subscriptions_csv(db: aiosqlite.Connection) -> AsyncIterator[str]:
     """Export subscriptions to CSV format."""
     cursor = await db.execute("""
         SELECT 
@@ -362,42 +428,40 @@ async def export_subscriptions_csv(db: aiosqlite.Connection) -> str:
         LEFT JOIN categories c ON s.category_id = c.id
         ORDER BY s.next_billing_date
     """)
-    rows = await cursor.fetchall()
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow(
-        [
-            "Name",
-            "Amount",
-            "Billing Cycle",
-            "Next Billing Date",
-            "Account",
-            "Category",
-            "Notes",
-            "Active",
-        ]
-    )
+    header = [
+        "Name",
+        "Amount",
+        "Billing Cycle",
+        "Next Billing Date",
+        "Account",
+        "Category",
+        "Notes",
+        "Active",
+    ]
 
-    for row in rows:
-        writer.writerow(
-            [
-                row["name"],
-                row["amount"],
-                row["billing_cycle"],
-                row["next_billing_date"],
-                row["account_name"] or "",
-                row["category_name"] or "",
-                row["notes"] or "",
-                "Yes" if row["is_active"] else "No",
-            ]
+    def to_line(row):
+        (
+            name,
+            amount,
+            billing_cycle,
+            next_billing_date,
+            account_name,
+            category_name,
+            notes,
+            is_active,
+        ) = row
+        return (
+            f"{_csv_text(name)},{amount},{billing_cycle},{next_billing_date},"
+            f"{_csv_text(account_name)},{_csv_text(category_name)},"
+            f"{_csv_text(notes)},{'Yes' if is_active else 'No'}\r\n"
         )
 
-    return output.getvalue()
+    async for chunk in _stream_csv(cursor, header, to_line):
+        yield chunk
 
 
-async def export_loans_csv(db: aiosqlite.Connection) -> str:
+async def export_loans_csv(db: aiosqlite.Connection) -> AsyncIterator[str]:
     """Export loans to CSV format."""
     cursor = await db.execute("""
         SELECT 
@@ -408,44 +472,116 @@ async def export_loans_csv(db: aiosqlite.Connection) -> str:
         LEFT JOIN accounts a ON l.account_id = a.id
         ORDER BY l.start_date DESC
     """)
-    rows = await cursor.fetchall()
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow(
-        [
-            "Name",
-            "Type",
-            "Original Principal",
-            "Current Balance",
-            "Interest Rate",
-            "Term (Months)",
-            "Start Date",
-            "Monthly Payment",
-            "Total Paid",
-            "Account",
-            "Notes",
-            "Active",
-        ]
-    )
+    header = [
+        "Name",
+        "Type",
+        "Original Principal",
+        "Current Balance",
+        "Interest Rate",
+        "Term (Months)",
+        "Start Date",
+        "Monthly Payment",
+        "Total Paid",
+        "Account",
+        "Notes",
+        "Active",
+    ]
 
-    for row in rows:
-        writer.writerow(
-            [
-                row["name"],
-                row["loan_type"],
-                row["original_principal"],
-                row["current_balance"],
-                row["interest_rate"],
-                row["term_months"],
-                row["start_date"],
-                row["monthly_payment"] or "",
-                row["total_paid"],
-                row["account_name"] or "",
-                row["notes"] or "",
-                "Yes" if row["is_active"] else "No",
-            ]
+    def to_line(row):
+        (
+            name,
+            loan_type,
+            original_principal,
+            current_balance,
+            interest_rate,
+            term_months,
+            start_date,
+            monthly_payment,
+            total_paid,
+            account_name,
+            notes,
+            is_active,
+        ) = row
+        return (
+            f"{_csv_text(name)},{loan_type},{original_principal},{current_balance},"
+            f"{interest_rate},{term_months},{start_date},{monthly_payment or ''},"
+            f"{total_paid},{_csv_text(account_name)},{_csv_text(notes)},"
+            f"{'Yes' if is_active else 'No'}\r\n"
         )
 
-    return output.getvalue()
+    async for chunk in _stream_csv(cursor, header, to_line):
+        yield chunk
+
+
+@lru_cache(maxsize=16)
+def _build_export_transactions_sql(
+    by_start: bool, by_end: bool, by_account: bool, by_category: bool
+) -> str:
+    """Build the transaction export query for one combination of filters."""
+    query = """
+        SELECT 
+            t.date,
+            t.amount,
+            t.description,
+            t.payee,
+            a.name as account_name,
+            c.name as category_name,
+            ta.name as transfer_to,
+            t.notes
+        FROM transactions t
+        LEFT JOIN accounts a ON t.account_id = a.id
+        LEFT JOIN categories c ON t.category_id = c.id
+        LEFT JOIN accounts ta ON t.transfer_to_account_id = ta.id
+        WHERE 1=1
+    """
+
+    if by_start:
+        query += " AND t.date >= ?"
+
+    if by_end:
+        query += " AND t.date <= ?"
+
+    if by_account:
+        query += " AND (t.account_id = ? OR t.transfer_to_account_id = ?)"
+
+    if by_category:
+        query += " AND t.category_id = ?"
+
+    return query + " ORDER BY t.date DESC, t.id DESC"
+
+
+def _csv_text(value: Optional[str]) -> str:
+    """
+    Format a free-text CSV field, quoting it only when it needs to be.
+    Matches csv.writer's default (QUOTE_MINIMAL) output.
+    """
+    if not value:
+        return ""
+    if _CSV_NEEDS_QUOTES.search(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+async def _stream_csv(
+    cursor: aiosqlite.Cursor,
+    header: list[str],
+    to_line: Callable[[aiosqlite.Row], str],
+) -> AsyncIterator[str]:
+    """
+    Write the header and one formatted line per cursor row, yielding the
+    text whenever roughly CSV_CHUNK_SIZE characters have been buffered.
+    """
+    output = io.StringIO()
+    write = output.write
+    write(",".join(header) + "\r\n")
+
+    async for row in cursor:
+        write(to_line(row))
+
+        if output.tell() >= CSV_CHUNK_SIZE:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+    yield output.getvalue()
@@ -1,5 +1,6 @@
 """Subscription service"""
 
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime, date, timedelta
 
@@ -15,29 +16,103 @@ from app.api.schemas.subscription import (
 from app.config import BILLING_CYCLES
 
 
-CYCLE_INFO = {cycle["value"]: cycle for cycle in BILLING_CYCLES}
+# Flat per-cycle lookups, so each helper does a single dict lookup
+_CYCLE_DAYS = {cycle["value"]: cycle["days"] for cycle in BILLING_CYCLES}
+_CYCLE_NAMES = {cycle["value"]: cycle["name"] for cycle in BILLING_CYCLES}
+
+# Cost multipliers per billing cycle; unknown cycles count as 30 days
+_YEARLY_FACTOR = {cycle["value"]: 365 / cycle["days"] for cycle in BILLING_CYCLES}
+_MONTHLY_FACTOR = {cycle["value"]: 30 / cycle["days"] for cycle in BILLING_CYCLES}
+
+_SUBSCRIPTION_COLUMNS = (
+    "id",
+    "name",
+    "amount",
+    "billing_cycle",
+    "next_billing_date",
+    "account_id",
+    "category_id",
+    "notes",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+_SUBSCRIPTION_SELECT = ", ".join(f"s.{column}" for column in _SUBSCRIPTION_COLUMNS)
+
+# Days per billing cycle as SQL, from the same table as get_cycle_days
+_CYCLE_DAYS_SQL = (
+    "CASE s.billing_cycle "
+    + " ".join(
+        f"WHEN '{cycle['value']}' THEN {cycle['days']}.0" for cycle in BILLING_CYCLES
+    )
+    + " ELSE 30.0 END"
+)
+
+_LIST_SUBSCRIPTIONS_SELECT = f"""
+    SELECT 
+        {_SUBSCRIPTION_SELECT},
+        a.name as account_name,
+        c.name as category_name,
+        TOTAL((30 / {_CYCLE_DAYS_SQL}) * s.amount) FILTER (WHERE s.is_active = 1)
+            OVER () as total_monthly,
+        TOTAL((365 / {_CYCLE_DAYS_SQL}) * s.amount) FILTER (WHERE s.is_active = 1)
+            OVER () as total_yearly
+    FROM subscriptions s
+    LEFT JOIN accounts a ON s.account_id = a.id
+    LEFT JOIN categories c ON s.category_id = c.id
+"""
+_LIST_SUBSCRIPTIONS_SQL = (
+    _LIST_SUBSCRIPTIONS_SELECT + "ORDER BY s.next_billing_date ASC"
+)
+_LIST_SUBSCRIPTIONS_BY_ACTIVE_SQL = (
+    _LIST_SUBSCRIPTIONS_SELECT
+    + "WHERE s.is_active = ? ORDER BY s.next_billing_date ASC"
+)
+
+# Reads only columns in idx_subscriptions_active_next_date, so the index
+# alone answers it, already in billing order
+_UPCOMING_RENEWALS_SQL = """
+    SELECT 
+        s.id, s.name, s.amount, s.next_billing_date,
+        a.name as account_name
+    FROM subscriptions s
+    LEFT JOIN accounts a ON s.account_id = a.id
+    WHERE s.is_active = 1
+        AND s.next_billing_date >= ?
+        AND s.next_billing_date <= ?
+    ORDER BY s.next_billing_date ASC
+    LIMIT ?
+"""
+
+# RETURNING clause that mirrors the joined columns of get_subscription
+_RETURNING_WITH_NAMES = f"""
+    RETURNING
+        {", ".join(_SUBSCRIPTION_COLUMNS)},
+        (SELECT name FROM accounts WHERE id = subscriptions.account_id) as account_name,
+        (SELECT name FROM categories WHERE id = subscriptions.category_id)
+            as category_name
+"""
 
 
 def get_cycle_days(billing_cycle: str) -> int:
     """Get the number of days in a billing cycle."""
-    return CYCLE_INFO.get(billing_cycle, {}).get("days", 30)
+    return _CYCLE_DAYS.get(billing_cycle, 30)
 
 
 def get_cycle_display(billing_cycle: str) -> str:
     """Get the human-readable name for a billing cycle."""
-    return CYCLE_INFO.get(billing_cycle, {}).get("name", billing_cycle)
+    return _CYCLE_NAMES.get(billing_cycle, billing_cycle)
 
 
 def calculate_yearly_cost(amount: float, billing_cycle: str) -> float:
     """Calculate the annualized cost of a subscription."""
-    days = get_cycle_days(billing_cycle)
-    return (365 / days) * amount
+    return _YEARLY_FACTOR.get(billing_cycle, 365 / 30) * amount
 
 
 def calculate_monthly_cost(amount: float, billing_cycle: str) -> float:
     """Calculate the monthly cost of a subscription."""
-    days = get_cycle_days(billing_cycle)
-    return (30 / days) * amount
+    return _MONTHLY_FACTOR.get(billing_cycle, 1.0) * amount
 
 
 async def create_subscription(
@@ -45,12 +120,13 @@ async def create_subscription(
 ) -> SubscriptionResponse:
     """Create a new subscription."""
     cursor = await db.execute(
-        """
+        f"""
         INSERT INTO subscriptions (
             name, amount, billing_cycle, next_billing_date,
             account_id, category_id, notes
         )
         VALUES (?, ?, ?, ?, ?, ?, ?)
+        {_RETURNING_WITH_NAMES}
         """,
         (
             subscription.name,
@@ -62,9 +138,10 @@ async def create_subscription(
             subscription.notes,
         ),
     )
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_subscription(db, cursor.lastrowid)
+    return _row_to_subscription_response(row)
 
 
 async def get_subscription(
@@ -72,9 +149,9 @@ async def get_subscription(
 ) -> Optional[SubscriptionResponse]:
     """Get a single subscription by ID with related data."""
     cursor = await db.execute(
-        """
+        f"""
         SELECT 
-            s.*,
+            {_SUBSCRIPTION_SELECT},
             a.name as account_name,
             c.name as category_name
         FROM subscriptions s
@@ -89,48 +166,65 @@ async def get_subscription(
     if not row:
         return None
 
-    return _row_to_subscription_response(dict(row))
+    return _row_to_subscription_response(row)
 
 
 async def get_all_subscriptions(
     db: aiosqlite.Connection, is_active: Optional[bool] = None
 ) -> SubscriptionListResponse:
     """Get all subscriptions with optional active filter."""
-    query = """
-        SELECT 
-            s.*,
-            a.name as account_name,
-            c.name as category_name
-        FROM subscriptions s
-        LEFT JOIN accounts a ON s.account_id = a.id
-        LEFT JOIN categories c ON s.category_id = c.id
-        WHERE 1=1
+    rows = await _fetch_subscriptions(db, is_active)
+
+    today = date.today()
+    subscriptions = [_row_to_subscription_response(row, today) for row in rows]
+
+    return SubscriptionListResponse(
+        subscriptions=subscriptions,
+        total=len(subscriptions),
+        **_list_totals(rows),
+    )
+
+
+async def get_subscription_dicts(
+    db: aiosqlite.Connection, is_active: Optional[bool] = None
+) -> dict:
+    """
+    Get all subscriptions as JSON-ready dicts in the shape of
+    SubscriptionListResponse. Skips building a response model per row.
     """
-    params = []
+    rows = await _fetch_subscriptions(db, is_active)
 
-    if is_active is not None:
-        query += " AND s.is_active = ?"
-        params.append(1 if is_active else 0)
+    today = date.today()
+    subscriptions = [_row_to_subscription_dict(row, today) for row in rows]
 
-    query += " ORDER BY s.next_billing_date ASC"
+    return {
+        "subscriptions": subscriptions,
+        "total": len(subscriptions),
+        **_list_totals(rows),
+    }
 
-    cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
 
-    subscriptions = [_row_to_subscription_response(dict(row)) for row in rows]
+async def _fetch_subscriptions(
+    db: aiosqlite.Connection, is_active: Optional[bool]
+) -> list[aiosqlite.Row]:
+    """Fetch joined subscription rows, each carrying the list totals."""
+    if is_active is None:
+        return await db.execute_fetchall(_LIST_SUBSCRIPTIONS_SQL)
 
-    active_subs = [s for s in subscriptions if s.is_active]
-    total_monthly = sum(
-        calculate_monthly_cost(s.amount, s.billing_cycle) for s in active_subs
+    return await db.execute_fetchall(
+        _LIST_SUBSCRIPTIONS_BY_ACTIVE_SQL, (1 if is_active else 0,)
     )
-    total_yearly = sum(s.yearly_cost for s in active_subs)
 
-    return SubscriptionListResponse(
-        subscriptions=subscriptions,
-        total=len(subscriptions),
-        total_monthly_cost=round(total_monthly, 2),
-        total_yearly_cost=round(total_yearly, 2),
-    )
+
+def _list_totals(rows: list[aiosqlite.Row]) -> dict:
+    """Read the window totals, which every row carries, from the first row."""
+    total_monthly = rows[0]["total_monthly"] if rows else 0
+    total_yearly = rows[0]["total_yearly"] if rows else 0
+
+    return {
+        "total_monthly_cost": round(total_monthly, 2),
+        "total_yearly_cost": round(total_yearly, 2),
+    }
 
 
 async def get_upcoming_renewals(
@@ -140,37 +234,23 @@ async def get_upcoming_renewals(
     today = date.today()
     end_date = today + timedelta(days=days_ahead)
 
-    cursor = await db.execute(
-        """
-        SELECT 
-            s.id, s.name, s.amount, s.next_billing_date,
-            a.name as account_name
-        FROM subscriptions s
-        LEFT JOIN accounts a ON s.account_id = a.id
-        WHERE s.is_active = 1
-            AND s.next_billing_date >= ?
-            AND s.next_billing_date <= ?
-        ORDER BY s.next_billing_date ASC
-        LIMIT ?
-        """,
-        (today.isoformat(), end_date.isoformat(), limit),
+    rows = await db.execute_fetchall(
+        _UPCOMING_RENEWALS_SQL, (today.isoformat(), end_date.isoformat(), limit)
     )
-    rows = await cursor.fetchall()
 
     renewals = []
-    for row in rows:
-        row_dict = dict(row)
-        next_date = date.fromisoformat(row_dict["next_billing_date"])
+    for subscription_id, name, amount, next_billing_date, account_name in rows:
+        next_date = date.fromisoformat(next_billing_date)
         days_until = (next_date - today).days
 
         renewals.append(
             UpcomingRenewal(
-                id=row_dict["id"],
-                name=row_dict["name"],
-                amount=row_dict["amount"],
+                id=subscription_id,
+                name=name,
+                amount=amount,
                 next_billing_date=next_date,
                 days_until_renewal=days_until,
-                account_name=row_dict.get("account_name"),
+                account_name=account_name,
             )
         )
 
@@ -194,13 +274,16 @@ async def update_subscription(
 
     update_data["updated_at"] = datetime.now().isoformat()
 
-    set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
     values = list(update_data.values()) + [subscription_id]
 
-    await db.execute(f"UPDATE subscriptions SET {set_clause} WHERE id = ?", values)
+    cursor = await db.execute(_build_update_sql(tuple(update_data)), values)
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_subscription(db, subscription_id)
+    if not row:
+        return None
+
+    return _row_to_subscription_response(row)
 
 
 async def delete_subscription(db: aiosqlite.Connection, subscription_id: int) -> bool:
@@ -228,54 +311,130 @@ async def advance_billing_date(
     current_date = subscription.next_billing_date
     next_date = current_date + timedelta(days=days)
 
-    await db.execute(
-        """
+    cursor = await db.execute(
+        f"""
         UPDATE subscriptions 
         SET next_billing_date = ?, updated_at = ?
         WHERE id = ?
+        {_RETURNING_WITH_NAMES}
         """,
         (next_date.isoformat(), datetime.now().isoformat(), subscription_id),
     )
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_subscription(db, subscription_id)
+    return _row_to_subscription_response(row)
 
 
-def _row_to_subscription_response(row: dict) -> SubscriptionResponse:
-    """Convert a database row to a SubscriptionResponse."""
-    next_billing_date = row.get("next_billing_date")
-    if isinstance(next_billing_date, str):
-        next_billing_date = date.fromisoformat(next_billing_date)
+async def advance_all_due(
+    db: aiosqlite.Connection, as_of: Optional[date] = None
+) -> list[SubscriptionResponse]:
+    """
+    Advance every active subscription due on or before as_of (default today)
+    by one billing cycle, in a single UPDATE.
+    """
+    today = date.today()
+    if as_of is None:
+        as_of = today
+
+    rows = await db.execute_fetchall(
+        f"""
+        UPDATE subscriptions AS s
+        SET next_billing_date = date(
+                next_billing_date, '+' || ({_CYCLE_DAYS_SQL}) || ' days'
+            ),
+            updated_at = ?
+        WHERE is_active = 1 AND next_billing_date <= ?
+        {_RETURNING_WITH_NAMES}
+        """,
+        (datetime.now().isoformat(), as_of.isoformat()),
+    )
+    await db.commit()
 
-    created_at = row.get("created_at")
-    if isinstance(created_at, str):
-        created_at = datetime.fromisoformat(created_at)
+    return [_row_to_subscription_response(row, today) for row in rows]
 
-    updated_at = row.get("updated_at")
-    if isinstance(updated_at, str):
-        updated_at = datetime.fromisoformat(updated_at)
 
-    today = date.today()
-    days_until = (next_billing_date - today).days if next_billing_date else 0
+@lru_cache(maxsize=256)
+def _build_update_sql(fields: tuple[str, ...]) -> str:
+    """Build the UPDATE statement for one set of changed columns."""
+    set_clause = ", ".join([f"{key} = ?" for key in fields])
+    return f"UPDATE subscriptions SET {set_clause} WHERE id = ? {_RETURNING_WITH_NAMES}"
+
+
+def _row_to_subscription_dict(row: aiosqlite.Row, today: date) -> dict:
+    """
+    Convert a joined database row to the JSON shape of a SubscriptionResponse.
+    Dates are already ISO strings in SQLite, so they are passed through.
+    """
+    subscription = dict(row)
+    del subscription["total_monthly"], subscription["total_yearly"]
+
+    billing_cycle = subscription["billing_cycle"]
+    next_billing_date = subscription["next_billing_date"]
+
+    subscription["billing_cycle_display"] = get_cycle_display(billing_cycle)
+    subscription["days_until_renewal"] = (
+        (date.fromisoformat(next_billing_date) - today).days if next_billing_date else 0
+    )
+    subscription["is_active"] = bool(subscription["is_active"])
+    subscription["yearly_cost"] = round(
+        calculate_yearly_cost(subscription["amount"], billing_cycle), 2
+    )
+
+    # CURRENT_TIMESTAMP defaults separate date and time with a space
+    for key in ("created_at", "updated_at"):
+        value = subscription[key]
+        subscription[key] = (
+            value.replace(" ", "T", 1) if value else datetime.now().isoformat()
+        )
 
-    billing_cycle = row["billing_cycle"]
-    yearly_cost = calculate_yearly_cost(row["amount"], billing_cycle)
+    return subscription
 
-    return SubscriptionResponse(
-        id=row["id"],
-        name=row["name"],
-        amount=row["amount"],
+
+def _row_to_subscription_response(
+    row: aiosqlite.Row, today: Optional[date] = None
+) -> SubscriptionResponse:
+    """
+    Convert a subscription row (_SUBSCRIPTION_COLUMNS order, then account_name
+    and category_name) to a response. Rows come from our own schema, so
+    validation is skipped. List callers pass today so it is read once.
+    """
+    (
+        subscription_id,
+        name,
+        amount,
+        billing_cycle,
+        next_billing_date,
+        account_id,
+        category_id,
+        notes,
+        is_active,
+        created_at,
+        updated_at,
+        account_name,
+        category_name,
+        *_,
+    ) = row
+
+    next_billing_date = date.fromisoformat(next_billing_date)
+    if today is None:
+        today = date.today()
+
+    return SubscriptionResponse.model_construct(
+        id=subscription_id,
+        name=name,
+        amount=amount,
         billing_cycle=billing_cycle,
         billing_cycle_display=get_cycle_display(billing_cycle),
         next_billing_date=next_billing_date,
-        days_until_renewal=days_until,
-        account_id=row.get("account_id"),
-        account_name=row.get("account_name"),
-        category_id=row.get("category_id"),
-        category_name=row.get("category_name"),
-        notes=row.get("notes"),
-        is_active=bool(row["is_active"]),
-        yearly_cost=round(yearly_cost, 2),
-        created_at=created_at or datetime.now(),
-        updated_at=updated_at or datetime.now(),
+        days_until_renewal=(next_billing_date - today).days,
+        account_id=account_id,
+        account_name=account_name,
+        category_id=category_id,
+        category_name=category_name,
+        notes=notes,
+        is_active=bool(is_active),
+        yearly_cost=round(calculate_yearly_cost(amount, billing_cycle), 2),
+        created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+        updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
     )
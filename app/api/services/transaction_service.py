@@ -1,5 +1,6 @@
 """Transaction service"""
 
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime, date
 
@@ -15,6 +16,39 @@ from app.api.schemas.transaction import (
 )
 
 
+# The trigram search index can only match terms of at least three characters;
+# shorter ones fall back to LIKE
+_MIN_INDEXED_SEARCH = 3
+
+# Row converters unpack positionally, so every query selects these in order,
+# followed by the account, category and transfer account names
+_TRANSACTION_COLUMNS = (
+    "id",
+    "date",
+    "amount",
+    "description",
+    "payee",
+    "notes",
+    "account_id",
+    "category_id",
+    "transfer_to_account_id",
+    "created_at",
+    "updated_at",
+)
+
+_TRANSACTION_SELECT = ", ".join(f"t.{column}" for column in _TRANSACTION_COLUMNS)
+
+# RETURNING clause that mirrors the joined columns of get_transaction
+_RETURNING_WITH_NAMES = f"""
+    RETURNING
+        {", ".join(_TRANSACTION_COLUMNS)},
+        (SELECT name FROM accounts WHERE id = transactions.account_id) as account_name,
+        (SELECT name FROM categories WHERE id = transactions.category_id) as category_name,
+        (SELECT name FROM accounts WHERE id = transactions.transfer_to_account_id)
+            as transfer_to_account_name
+"""
+
+
 async def create_transaction(
     db: aiosqlite.Connection, transaction: TransactionCreate
 ) -> TransactionResponse:
@@ -22,12 +56,13 @@ async def create_transaction(
     Create a new transaction and update account balance(s).
     """
     cursor = await db.execute(
-        """
+        f"""
         INSERT INTO transactions (
             date, amount, description, payee, notes,
             account_id, category_id, transfer_to_account_id
         )
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        {_RETURNING_WITH_NAMES}
         """,
         (
             transaction.date.isoformat(),
@@ -40,18 +75,18 @@ async def create_transaction(
             transaction.transfer_to_account_id,
         ),
     )
-    transaction_id = cursor.lastrowid
-
-    await _update_account_balance(db, transaction.account_id, transaction.amount)
-
-    if transaction.transfer_to_account_id:
-        await _update_account_balance(
-            db, transaction.transfer_to_account_id, -transaction.amount
-        )
+    row = await cursor.fetchone()
 
+    await _apply_balance_change(
+        db,
+        transaction.account_id,
+        transaction.transfer_to_account_id,
+        transaction.amount,
+        datetime.now().isoformat(),
+    )
     await db.commit()
 
-    return await get_transaction(db, transaction_id)
+    return _row_to_transaction_response(row)
 
 
 async def get_transaction(
@@ -59,9 +94,9 @@ async def get_transaction(
 ) -> Optional[TransactionResponse]:
     """Get a single transaction by ID with related data."""
     cursor = await db.execute(
-        """
+        f"""
         SELECT 
-            t.*,
+            {_TRANSACTION_SELECT},
             a.name as account_name,
             c.name as category_name,
             ta.name as transfer_to_account_name
@@ -78,7 +113,7 @@ async def get_transaction(
     if not row:
         return None
 
-    return _row_to_transaction_response(dict(row))
+    return _row_to_transaction_response(row)
 
 
 async def get_transactions(
@@ -94,87 +129,127 @@ async def get_transactions(
     offset: int = 0,
 ) -> TransactionListResponse:
     """Get transactions with filters."""
-    query = """
+    rows, total = await _fetch_transactions(
+        db,
+        account_id,
+        category_id,
+        start_date,
+        end_date,
+        min_amount,
+        max_amount,
+        search,
+        limit,
+        offset,
+    )
+    transactions = [_row_to_transaction_response(row) for row in rows]
+
+    return TransactionListResponse(transactions=transactions, total=total)
+
+
+async def get_transaction_dicts(db: aiosqlite.Connection, **filters) -> dict:
+    """
+    Get transactions with the same filters as get_transactions, as JSON-ready
+    dicts. Skips building a response model per row for the list endpoint.
+    """
+    rows, total = await _fetch_transactions(db, **filters)
+
+    return {
+        "transactions": [_row_to_transaction_dict(row) for row in rows],
+        "total": total,
+    }
+
+
+async def _fetch_transactions(
+    db: aiosqlite.Connection,
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    search: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> tuple[list[aiosqlite.Row], int]:
+    """
+    Fetch one page of joined transaction rows and the total match count.
+    The page and the total count come back from a single joined query.
+    """
+    query = f"""
         SELECT 
-            t.*,
+            {_TRANSACTION_SELECT},
             a.name as account_name,
             c.name as category_name,
-            ta.name as transfer_to_account_name
+            ta.name as transfer_to_account_name,
+            COUNT(*) OVER () as total
         FROM transactions t
         LEFT JOIN accounts a ON t.account_id = a.id
         LEFT JOIN categories c ON t.category_id = c.id
         LEFT JOIN accounts ta ON t.transfer_to_account_id = ta.id
         WHERE 1=1
     """
-    count_query = "SELECT COUNT(*) as total FROM transactions t WHERE 1=1"
+    conditions = ""
     params = []
-    count_params = []
 
     if account_id:
-        condition = " AND (t.account_id = ? OR t.transfer_to_account_id = ?)"
-        query += condition
-        count_query += condition
+        conditions += " AND (t.account_id = ? OR t.transfer_to_account_id = ?)"
         params.extend([account_id, account_id])
-        count_params.extend([account_id, account_id])
 
     if category_id:
-        condition = " AND t.category_id = ?"
-        query += condition
-        count_query += condition
+        conditions += " AND t.category_id = ?"
         params.append(category_id)
-        count_params.append(category_id)
 
     if start_date:
-        condition = " AND t.date >= ?"
-        query += condition
-        count_query += condition
+        conditions += " AND t.date >= ?"
         params.append(start_date.isoformat())
-        count_params.append(start_date.isoformat())
 
     if end_date:
-        condition = " AND t.date <= ?"
-        query += condition
-        count_query += condition
+        conditions += " AND t.date <= ?"
         params.append(end_date.isoformat())
-        count_params.append(end_date.isoformat())
 
     if min_amount is not None:
-        condition = " AND ABS(t.amount) >= ?"
-        query += condition
-        count_query += condition
+        conditions += " AND ABS(t.amount) >= ?"
         params.append(abs(min_amount))
-        count_params.append(abs(min_amount))
 
     if max_amount is not None:
-        condition = " AND ABS(t.amount) <= ?"
-        query += condition
-        count_query += condition
+        conditions += " AND ABS(t.amount) <= ?"
         params.append(abs(max_amount))
-        count_params.append(abs(max_amount))
 
-    if search:
-        condition = " AND (t.description LIKE ? OR t.payee LIKE ? OR t.notes LIKE ?)"
+    if search and len(search) >= _MIN_INDEXED_SEARCH:
+        # Left alone, the planner walks the search matches by rowid. With a
+        # closed date range, "+" keeps the date index in charge and checks
+        # the matches as a filter instead
+        rowid = "+t.id" if start_date and end_date else "t.id"
+        conditions += (
+            f" AND {rowid} IN (SELECT rowid FROM transactions_fts"
+            " WHERE transactions_fts MATCH ?)"
+        )
+        # One quoted phrase, so the term is matched as a plain substring
+        params.append('"' + search.replace('"', '""') + '"')
+    elif search:
+        conditions += " AND (t.description LIKE ? OR t.payee LIKE ? OR t.notes LIKE ?)"
         search_term = f"%{search}%"
-        query += condition
-        count_query += condition
         params.extend([search_term, search_term, search_term])
-        count_params.extend([search_term, search_term, search_term])
-
-    # Get total count
-    cursor = await db.execute(count_query, count_params)
-    total_row = await cursor.fetchone()
-    total = total_row["total"]
 
     # Get transactions with pagination
-    query += " ORDER BY t.date DESC, t.id DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+    query += conditions + " ORDER BY t.date DESC, t.id DESC LIMIT ? OFFSET ?"
 
-    cursor = await db.execute(query, params)
-    rows = await cursor.fetchall()
+    rows = await db.execute_fetchall(query, [*params, limit, offset])
 
-    transactions = [_row_to_transaction_response(dict(row)) for row in rows]
+    if rows:
+        total = rows[0]["total"]
+    elif offset:
+        # Paged past the end, so there is no row to read the total from
+        cursor = await db.execute(
+            f"SELECT COUNT(*) as total FROM transactions t WHERE 1=1{conditions}",
+            params,
+        )
+        total_row = await cursor.fetchone()
+        total = total_row["total"]
+    else:
+        total = 0
 
-    return TransactionListResponse(transactions=transactions, total=total)
+    return rows, total
 
 
 async def get_recent_transactions(
@@ -189,61 +264,67 @@ async def update_transaction(
     db: aiosqlite.Connection, transaction_id: int, update: TransactionUpdate
 ) -> Optional[TransactionResponse]:
     """Update a transaction and adjust account balance if amount changed."""
-    existing = await get_transaction(db, transaction_id)
-    if not existing:
-        return None
-
     update_data = update.model_dump(exclude_unset=True)
 
     if not update_data:
-        return existing
+        return await get_transaction(db, transaction_id)
+
+    now = datetime.now().isoformat()
 
     if "date" in update_data and update_data["date"]:
         update_data["date"] = update_data["date"].isoformat()
 
     if "amount" in update_data:
-        old_amount = existing.amount
-        new_amount = update_data["amount"]
-        difference = new_amount - old_amount
+        # Only the columns the balance adjustment needs
+        cursor = await db.execute(
+            "SELECT amount, account_id, transfer_to_account_id "
+            "FROM transactions WHERE id = ?",
+            (transaction_id,),
+        )
+        existing = await cursor.fetchone()
+        if not existing:
+            return None
 
-        if difference != 0:
-            await _update_account_balance(db, existing.account_id, difference)
+        old_amount, account_id, transfer_to_account_id = existing
+        difference = update_data["amount"] - old_amount
 
-            if existing.transfer_to_account_id:
-                await _update_account_balance(
-                    db, existing.transfer_to_account_id, -difference
-                )
+        if difference != 0:
+            await _apply_balance_change(
+                db, account_id, transfer_to_account_id, difference, now
+            )
 
-    update_data["updated_at"] = datetime.now().isoformat()
+    update_data["updated_at"] = now
 
-    set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
     values = list(update_data.values()) + [transaction_id]
 
-    await db.execute(f"UPDATE transactions SET {set_clause} WHERE id = ?", values)
+    cursor = await db.execute(_build_update_sql(tuple(update_data)), values)
+    row = await cursor.fetchone()
     await db.commit()
 
-    return await get_transaction(db, transaction_id)
+    if not row:
+        return None
+
+    return _row_to_transaction_response(row)
 
 
 async def delete_transaction(db: aiosqlite.Connection, transaction_id: int) -> bool:
     """Delete a transaction and reverse its effect on account balance."""
-    existing = await get_transaction(db, transaction_id)
-    if not existing:
+    cursor = await db.execute(
+        "DELETE FROM transactions WHERE id = ? "
+        "RETURNING amount, account_id, transfer_to_account_id",
+        (transaction_id,),
+    )
+    deleted = await cursor.fetchone()
+    if not deleted:
         return False
 
-    await _update_account_balance(db, existing.account_id, -existing.amount)
-
-    if existing.transfer_to_account_id:
-        await _update_account_balance(
-            db, existing.transfer_to_account_id, existing.amount
-        )
-
-    cursor = await db.execute(
-        "DELETE FROM transactions WHERE id = ?", (transaction_id,)
+    amount, account_id, transfer_to_account_id = deleted
+    await _apply_balance_change(
+        db, account_id, transfer_to_account_id, -amount, datetime.now().isoformat()
     )
     await db.commit()
 
-    return cursor.rowcount > 0
+    return True
 
 
 async def get_monthly_spending(
@@ -258,12 +339,13 @@ async def get_monthly_spending(
     else:
         end_date = f"{year}-{month + 1:02d}-01"
 
-    cursor = await db.execute(
+    rows = await db.execute_fetchall(
         """
         SELECT 
             c.id as category_id,
             c.name as category_name,
-            SUM(ABS(t.amount)) as total
+            SUM(ABS(t.amount)) as total,
+            SUM(SUM(ABS(t.amount))) OVER () as total_spent
         FROM transactions t
         JOIN categories c ON t.category_id = c.id
         WHERE t.date >= ? AND t.date < ?
@@ -275,75 +357,117 @@ async def get_monthly_spending(
         (start_date, end_date),
     )
 
-    rows = await cursor.fetchall()
-
-    data = []
-    total_spent = 0.0
-
-    for row in rows:
-        row_dict = dict(row)
-        total = row_dict["total"] or 0
-        data.append(
-            MonthlySpending(
-                month=month_str,
-                category_id=row_dict["category_id"],
-                category_name=row_dict["category_name"],
-                total=total,
-            )
+    # Built from our own aggregate, so the entries skip validation; amount is
+    # NOT NULL, so every group's SUM is a number
+    data = [
+        MonthlySpending.model_construct(
+            month=month_str,
+            category_id=category_id,
+            category_name=category_name,
+            total=total,
         )
-        total_spent += total
+        for category_id, category_name, total, _ in rows
+    ]
 
-    return MonthlySpendingResponse(
+    return MonthlySpendingResponse.model_construct(
         data=data,
-        total_spent=total_spent,
+        total_spent=rows[0]["total_spent"] if rows else 0.0,
         month=month_str,
     )
 
 
-async def _update_account_balance(
-    db: aiosqlite.Connection, account_id: int, amount: float
+async def _apply_balance_change(
+    db: aiosqlite.Connection,
+    account_id: int,
+    transfer_to_account_id: Optional[int],
+    amount: float,
+    updated_at: str,
 ) -> None:
     """
-    Update an account's balance by the given amount.
+    Add amount to an account's balance and, for a transfer, take it from the
+    destination account, in a single UPDATE.
+    Without a transfer the destination is NULL, so only account_id matches.
     """
     await db.execute(
         """
-        UPDATE accounts 
-        SET current_balance = current_balance + ?,
+        UPDATE accounts
+        SET current_balance = current_balance + CASE id WHEN ? THEN ? ELSE ? END,
             updated_at = ?
-        WHERE id = ?
+        WHERE id IN (?, ?)
         """,
-        (amount, datetime.now().isoformat(), account_id),
+        (
+            account_id,
+            amount,
+            -amount,
+            updated_at,
+            account_id,
+            transfer_to_account_id,
+        ),
     )
 
 
-def _row_to_transaction_response(row: dict) -> TransactionResponse:
-    """Convert a database row to a TransactionResponse."""
-    date_val = row.get("date")
-    if isinstance(date_val, str):
-        date_val = date.fromisoformat(date_val)
-
-    created_at = row.get("created_at")
-    if isinstance(created_at, str):
-        created_at = datetime.fromisoformat(created_at)
-
-    updated_at = row.get("updated_at")
-    if isinstance(updated_at, str):
-        updated_at = datetime.fromisoformat(updated_at)
-
-    return TransactionResponse(
-        id=row["id"],
-        date=date_val,
-        amount=row["amount"],
-        description=row.get("description"),
-        payee=row.get("payee"),
-        notes=row.get("notes"),
-        account_id=row["account_id"],
-        account_name=row.get("account_name"),
-        category_id=row.get("category_id"),
-        category_name=row.get("category_name"),
-        transfer_to_account_id=row.get("transfer_to_account_id"),
-        transfer_to_account_name=row.get("transfer_to_account_name"),
-        created_at=created_at or datetime.now(),
-        updated_at=updated_at or datetime.now(),
+@lru_cache(maxsize=256)
+def _build_update_sql(fields: tuple[str, ...]) -> str:
+    """Build the UPDATE statement for one set of changed columns."""
+    set_clause = ", ".join([f"{key} = ?" for key in fields])
+    return f"UPDATE transactions SET {set_clause} WHERE id = ? {_RETURNING_WITH_NAMES}"
+
+
+def _row_to_transaction_dict(row: aiosqlite.Row) -> dict:
+    """
+    Convert a joined database row to the JSON shape of a TransactionResponse.
+    Dates are already ISO strings in SQLite, so they are passed through.
+    """
+    transaction = dict(row)
+    del transaction["total"]
+
+    # CURRENT_TIMESTAMP defaults separate date and time with a space
+    for key in ("created_at", "updated_at"):
+        value = transaction[key]
+        transaction[key] = (
+            value.replace(" ", "T", 1) if value else datetime.now().isoformat()
+        )
+
+    return transaction
+
+
+def _row_to_transaction_response(row: aiosqlite.Row) -> TransactionResponse:
+    """
+    Convert a transaction row (_TRANSACTION_COLUMNS order, then the account,
+    category and transfer account names) to a response.
+    Rows come from our own schema, so validation is skipped.
+    """
+    (
+        transaction_id,
+        date_val,
+        amount,
+        description,
+        payee,
+        notes,
+        account_id,
+        category_id,
+        transfer_to_account_id,
+        created_at,
+        updated_at,
+        account_name,
+        category_name,
+        transfer_to_account_name,
+        *_,
+    ) = row
+
+    return TransactionResponse.model_construct(
+        id=transaction_id,
+        date=date.fromisoformat(date_val),
+        amount=amount,
+        description=description,
+        payee=payee,
+        notes=notes,
+        account_id=account_id,
+        account_name=account_name,
+        category_id=category_id,
+        category_name=category_name,
+        transfer_to_account_id=transfer_to_account_id,
+        transfer_to_account_name=transfer_to_account_name,
+        created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+        updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
     )
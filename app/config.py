@@ -9,6 +9,20 @@ DATABASE_PATH = DATA_DIR / "tracker.db"
 
 DATA_DIR.mkdir(exist_ok=True)
 
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+# Seconds a writer waits for another connection's write transaction to finish
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", "5"))
+
+# Per-connection page cache in KiB and memory-mapped I/O window in bytes
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "65536"))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Seconds between PRAGMA optimize runs that refresh query planner statistics
+DB_OPTIMIZE_INTERVAL = float(os.getenv("DB_OPTIMIZE_INTERVAL", str(15 * 60)))
+
 SECRET_KEY = os.getenv("SECRET_KEY", "change-this-secret-key-in-production")
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7
@@ -1,25 +1,131 @@
 """Database connection and initialization"""
 
+import asyncio
+
 import aiosqlite
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.config import DATABASE_PATH
+from app.config import (
+    DATABASE_PATH,
+    DB_POOL_SIZE,
+    DB_BUSY_TIMEOUT,
+    DB_CACHE_SIZE_KB,
+    DB_MMAP_SIZE,
+    DB_OPTIMIZE_INTERVAL,
+)
 
 
 async def get_db() -> aiosqlite.Connection:
     """
     Get a database connection.
+
+    Write transactions open with BEGIN IMMEDIATE, so pooled connections queue
+    for SQLite's single write lock up front (waiting up to DB_BUSY_TIMEOUT)
+    instead of failing with SQLITE_BUSY when a read upgrades to a write.
     """
-    db = await aiosqlite.connect(DATABASE_PATH)
+    db = await aiosqlite.connect(
+        DATABASE_PATH, timeout=DB_BUSY_TIMEOUT, isolation_level="IMMEDIATE"
+    )
     db.row_factory = aiosqlite.Row
+    await db.execute("PRAGMA journal_mode = WAL")
+    await db.execute("PRAGMA synchronous = NORMAL")
+    await db.execute("PRAGMA foreign_keys = ON")
+    # Pooled connections live for the whole process, so give each a larger
+    # page cache and let reads come straight from the mapped file
+    await db.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+    await db.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    await db.execute("PRAGMA temp_store = MEMORY")
     return db
 
 
+async def create_pool(
+    size: int = DB_POOL_SIZE,
+) -> asyncio.Queue[aiosqlite.Connection]:
+    """
+    Open a fixed set of connections and return them as a queue-backed pool.
+    Connections are opened eagerly so the first requests don't pay for it.
+    """
+    pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue(maxsize=size)
+
+    for _ in range(size):
+        pool.put_nowait(await get_db())
+
+    return pool
+
+
+async def close_pool(pool: asyncio.Queue[aiosqlite.Connection]):
+    """Close every idle connection in the pool."""
+    while not pool.empty():
+        db = pool.get_nowait()
+        await db.close()
+
+
+async def release_db(
+    pool: asyncio.Queue[aiosqlite.Connection], db: aiosqlite.Connection
+):
+    """Roll back anything left uncommitted and return a connection to the pool."""
+    if db.in_transaction:
+        await db.rollback()
+    pool.put_nowait(db)
+
+
+async def optimize_db(pool: asyncio.Queue[aiosqlite.Connection]):
+    """Let SQLite refresh any stale query planner statistics."""
+    db = await pool.get()
+    try:
+        await db.execute("PRAGMA optimize")
+    finally:
+        await release_db(pool, db)
+
+
+async def optimize_periodically(
+    pool: asyncio.Queue[aiosqlite.Connection],
+    interval: float = DB_OPTIMIZE_INTERVAL,
+):
+    """
+    Run optimize_db every interval seconds until cancelled.
+    A failed run (e.g. the database is busy) is retried on the next tick.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await optimize_db(pool)
+        except aiosqlite.Error:
+            pass
+
+
+class DBConnectionMiddleware:
+    """
+    Return the connection borrowed by the get_db dependency to the pool
+    once the response has been sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            db = scope.get("state", {}).pop("db", None)
+            if db is not None:
+                await release_db(scope["app"].state.db_pool, db)
+
+
 async def init_db():
     """
     Initialize the database with all required tables.
     """
     async with aiosqlite.connect(DATABASE_PATH) as db:
         await db.execute("PRAGMA foreign_keys = ON")
+        # WAL is persistent, so switch the file over before the schema and
+        # search index are built rather than when the pool first connects
+        await db.execute("PRAGMA journal_mode = WAL")
+        await db.execute("PRAGMA synchronous = NORMAL")
 
         await _create_users_table(db)
         await _create_accounts_table(db)
@@ -79,6 +185,15 @@ async def _create_accounts_table(db: aiosqlite.Connection):
         )
     """)
 
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_accounts_name ON accounts(name)
+    """)
+
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_accounts_type_active_name
+        ON accounts(account_type, is_active, name)
+    """)
+
 
 async def _create_categories_table(db: aiosqlite.Connection):
     """Create the categories table."""
@@ -129,6 +244,79 @@ async def _create_transactions_table(db: aiosqlite.Connection):
         CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions(account_id)
     """)
 
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_account_date
+        ON transactions(account_id, date)
+    """)
+
+    # With idx_transactions_account_date, lets the planner answer the
+    # account filter's OR as two indexed range scans
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_transfer_date
+        ON transactions(transfer_to_account_id, date)
+    """)
+
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_category_date
+        ON transactions(category_id, date)
+    """)
+
+    await _create_transactions_search_index(db)
+
+
+async def _create_transactions_search_index(db: aiosqlite.Connection):
+    """
+    Create the trigram full-text index behind transaction search.
+    It reads its text from the transactions table and is kept in step by
+    triggers; a database that predates it is indexed once on creation.
+    """
+    cursor = await db.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'"
+    )
+    exists = await cursor.fetchone() is not None
+
+    await db.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+            description, payee, notes,
+            content = 'transactions', content_rowid = 'id', tokenize = 'trigram'
+        )
+    """)
+
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_insert
+        AFTER INSERT ON transactions BEGIN
+            INSERT INTO transactions_fts (rowid, description, payee, notes)
+            VALUES (new.id, new.description, new.payee, new.notes);
+        END
+    """)
+
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_delete
+        AFTER DELETE ON transactions BEGIN
+            INSERT INTO transactions_fts (
+                transactions_fts, rowid, description, payee, notes
+            )
+            VALUES ('delete', old.id, old.description, old.payee, old.notes);
+        END
+    """)
+
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_update
+        AFTER UPDATE OF description, payee, notes ON transactions BEGIN
+            INSERT INTO transactions_fts (
+                transactions_fts, rowid, description, payee, notes
+            )
+            VALUES ('delete', old.id, old.description, old.payee, old.notes);
+            INSERT INTO transactions_fts (rowid, description, payee, notes)
+            VALUES (new.id, new.description, new.payee, new.notes);
+        END
+    """)
+
+    if not exists:
+        await db.execute(
+            "INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')"
+        )
+
 
 async def _create_subscriptions_table(db: aiosqlite.Connection):
     """Create the subscriptions table."""
@@ -159,6 +347,24 @@ async def _create_subscriptions_table(db: aiosqlite.Connection):
         CREATE INDEX IF NOT EXISTS idx_subscriptions_next_date ON subscriptions(next_billing_date)
     """)
 
+    # Covers upcoming renewals, and active-filtered lists in billing order
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_subscriptions_active_next_date
+        ON subscriptions(is_active, next_billing_date, name, amount, account_id)
+    """)
+
+    # Deleting an account or category nulls these links; without an index
+    # each delete scans the whole table
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_subscriptions_account
+        ON subscriptions(account_id)
+    """)
+
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_subscriptions_category
+        ON subscriptions(category_id)
+    """)
+
 
 async def _create_loans_table(db: aiosqlite.Connection):
     """Create the loans table for detailed loan tracking."""
@@ -188,6 +394,10 @@ async def _create_loans_table(db: aiosqlite.Connection):
         )
     """)
 
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_loans_account ON loans(account_id)
+    """)
+
 
 async def _create_loan_payments_table(db: aiosqlite.Connection):
     """Create the loan_payments table to track individual payments."""
@@ -216,6 +426,11 @@ async def _create_loan_payments_table(db: aiosqlite.Connection):
         CREATE INDEX IF NOT EXISTS idx_loan_payments_date ON loan_payments(payment_date)
     """)
 
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_loan_payments_loan_date
+        ON loan_payments(loan_id, payment_date DESC, id DESC)
+    """)
+
 
 async def seed_categories():
     """
@@ -224,13 +439,12 @@ async def seed_categories():
     from app.config import DEFAULT_CATEGORIES
 
     async with aiosqlite.connect(DATABASE_PATH) as db:
-        for category in DEFAULT_CATEGORIES:
-            await db.execute(
-                """
-                INSERT OR IGNORE INTO categories (name, type, is_system)
-                VALUES (?, ?, 1)
-            """,
-                (category["name"], category["type"]),
-            )
+        await db.executemany(
+            """
+            INSERT OR IGNORE INTO categories (name, type, is_system)
+            VALUES (?, ?, 1)
+        """,
+            [(category["name"], category["type"]) for category in DEFAULT_CATEGORIES],
+        )
 
         await db.commit()
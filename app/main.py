@@ -1,18 +1,22 @@
 """Transaction Tracker API"""
 
+import asyncio
 from pathlib import Path
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI, Request
+import aiosqlite
+from fastapi import Depends, FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 
 from app.config import APP_NAME, APP_VERSION
-from app.database import get_db as db_connect
-from app.database import init_db, seed_categories
+from app.database import init_db, seed_categories, create_pool, close_pool
+from app.database import optimize_db, optimize_periodically
+from app.database import DBConnectionMiddleware
+from app.api.cache import RequestCacheMiddleware
 from app.api.services.auth_service import user_exists
-from app.api.dependencies import get_optional_user
+from app.api.dependencies import get_db, get_optional_user
 from app.api.routes import (
     auth,
     accounts,
@@ -33,15 +37,33 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     await init_db()
     await seed_categories()
+    app.state.db_pool = await create_pool()
+    await optimize_db(app.state.db_pool)
+    optimizer = asyncio.create_task(optimize_periodically(app.state.db_pool))
+
+    # Compile page templates and the OpenAPI schema up front so the first
+    # requests don't pay for it
+    for template in TEMPLATES_DIR.glob("*.html"):
+        templates.get_template(template.name)
+    app.openapi()
+
     yield
+    optimizer.cancel()
+    with suppress(asyncio.CancelledError):
+        await optimizer
+    await close_pool(app.state.db_pool)
 
 
 app = FastAPI(
     title=APP_NAME,
     version=APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+app.add_middleware(DBConnectionMiddleware)
+app.add_middleware(RequestCacheMiddleware)
+
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
@@ -57,21 +79,17 @@ app.include_router(reports.router)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def home(request: Request):
+async def home(request: Request, db: aiosqlite.Connection = Depends(get_db)):
     """Home page - redirects to login or dashboard based on auth status."""
-    db = await db_connect()
-    try:
-        if not await user_exists(db):
-            return RedirectResponse(url="/setup", status_code=302)
-
-        user = await get_optional_user(request, None, db)
-
-        if user:
-            return RedirectResponse(url="/dashboard", status_code=302)
-        else:
-            return RedirectResponse(url="/login", status_code=302)
-    finally:
-        await db.close()
+    if not await user_exists(db):
+        return RedirectResponse(url="/setup", status_code=302)
+
+    user = await get_optional_user(request, db)
+
+    if user:
+        return RedirectResponse(url="/dashboard", status_code=302)
+    else:
+        return RedirectResponse(url="/login", status_code=302)
 
 
 @app.get("/setup", response_class=HTMLResponse)
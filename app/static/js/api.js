@@ -198,7 +198,7 @@ async function apiRequest(url, options = {}) {
  * Verify the session is valid by making a lightweight API call.
  */
 function checkAuth() {
-    api.get('/accounts/summary').then(response => {
+    api.get('/accounts/summary?include_accounts=false').then(response => {
         if (!response.ok) {
             window.location.href = '/login';
         }
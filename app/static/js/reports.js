@@ -199,6 +199,8 @@ function renderCategoryTable(data) {
     `).join('');
 }
 
+const monthLabel = new Intl.DateTimeFormat('en-US', { month: 'short', year: 'numeric' });
+
 function renderTrendsChart(data) {
     const ctx = document.getElementById('trends-chart').getContext('2d');
     
@@ -211,7 +213,7 @@ function renderTrendsChart(data) {
     }
     
     const months = data.months;
-    const labels = months.map(m => m.month_label);
+    const labels = months.map(m => monthLabel.format(new Date(m.year, m.month - 1)));
     const incomeData = months.map(m => m.income);
     const expenseData = months.map(m => m.expenses);
     const netData = months.map(m => m.net);
@@ -7,6 +7,7 @@ import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
+from app.api.cache import USER_CACHE, TOKEN_CACHE, CATEGORY_CACHE
 from app.api.services.auth_service import hash_password
 
 
@@ -22,6 +23,18 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Keep in-process caches from leaking between test databases."""
+    USER_CACHE.clear()
+    TOKEN_CACHE.clear()
+    CATEGORY_CACHE.clear()
+    yield
+    USER_CACHE.clear()
+    TOKEN_CACHE.clear()
+    CATEGORY_CACHE.clear()
+
+
 @pytest_asyncio.fixture
 async def db():
     """Provide a fresh in-memory database for each test."""
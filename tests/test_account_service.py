@@ -130,3 +130,25 @@ class TestAccountSummary:
     async def test_summary_empty(self, db_with_user):
         summary = await get_account_summary(db_with_user)
         assert summary.net_worth == 0.0
+
+    async def test_summary_with_liabilities(self, db_with_account):
+        await create_account(
+            db_with_account,
+            CreditCardCreate(name="Visa", current_balance=300.0, credit_limit=5000.0),
+        )
+        summary = await get_account_summary(db_with_account, include_accounts=True)
+        assert summary.total_assets == 1000.0
+        assert summary.total_liabilities == 300.0
+        assert summary.net_worth == 700.0
+        assert list(summary.accounts_by_type) == ["bank", "credit_card"]
+        assert [a.name for a in summary.accounts_by_type["credit_card"]] == ["Visa"]
+        assert summary.accounts_by_type["credit_card"][0].available_credit == 4700.0
+
+    async def test_summary_totals_only(self, db_with_account):
+        await create_account(
+            db_with_account,
+            CreditCardCreate(name="Visa", current_balance=300.0, credit_limit=5000.0),
+        )
+        summary = await get_account_summary(db_with_account)
+        assert summary.net_worth == 700.0
+        assert summary.accounts_by_type == {}
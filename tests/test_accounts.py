@@ -102,6 +102,10 @@ class TestGetAccount:
         resp = await client.get("/api/accounts/9999")
         assert resp.status_code == 404
 
+    async def test_get_account_non_numeric_id(self, client):
+        resp = await client.get("/api/accounts/abc")
+        assert resp.status_code == 404
+
 
 @pytest.mark.asyncio
 class TestUpdateAccount:
@@ -144,10 +148,8 @@ class TestDeleteAccount:
         resp = await client.delete(f"/api/accounts/{account_id}")
         assert resp.status_code == 204
 
-        # Note: the delete route currently has a bug — it checks existence
-        # but doesn't call delete_account(). Once fixed, re-enable this:
-        # resp = await client.get(f"/api/accounts/{account_id}")
-        # assert resp.status_code == 404
+        resp = await client.get(f"/api/accounts/{account_id}")
+        assert resp.status_code == 404
 
     async def test_delete_nonexistent_account(self, client):
         resp = await client.delete("/api/accounts/9999")
@@ -179,3 +181,30 @@ class TestAccountSummary:
         data = resp.json()
         assert data["total_assets"] == 5000.0
         assert data["net_worth"] == 5000.0
+
+    async def test_summary_not_modified(self, client):
+        resp = await client.get("/api/accounts/summary")
+        etag = resp.headers["etag"]
+
+        resp = await client.get(
+            "/api/accounts/summary", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+
+    async def test_summary_etag_changes_with_data(self, client):
+        resp = await client.get("/api/accounts/summary")
+        etag = resp.headers["etag"]
+
+        await client.post(
+            "/api/accounts/bank",
+            json={
+                "name": "Investment",
+                "account_type": "investment",
+                "current_balance": 5000,
+            },
+        )
+        resp = await client.get(
+            "/api/accounts/summary", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
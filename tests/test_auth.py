@@ -1,8 +1,13 @@
 """Tests for authentication routes."""
 
+from types import SimpleNamespace
+
 import pytest
+from fastapi import HTTPException
 from httpx import ASGITransport, AsyncClient
 
+from app.api.dependencies import get_current_user
+
 from tests.conftest import TEST_USER
 
 
@@ -94,6 +99,28 @@ class TestAuthMe:
         resp = await unauth_client.get("/api/auth/me")
         assert resp.status_code == 401
 
+    async def test_unauthenticated_raises_fresh_exceptions(self, db_with_user):
+        request = SimpleNamespace(headers={})
+
+        raised = []
+        for _ in range(2):
+            with pytest.raises(HTTPException) as excinfo:
+                await get_current_user(request, db_with_user)
+            raised.append(excinfo.value)
+
+        # A shared instance would keep every raising frame on its traceback
+        assert raised[0] is not raised[1]
+        assert raised[1].status_code == 401
+
+    async def test_get_current_user_from_cookie(self, unauth_client):
+        await unauth_client.post(
+            "/api/auth/login",
+            data={"username": TEST_USER["username"], "password": TEST_USER["password"]},
+        )
+        resp = await unauth_client.get("/api/auth/me")
+        assert resp.status_code == 200
+        assert resp.json()["username"] == TEST_USER["username"]
+
 
 @pytest.mark.asyncio
 class TestAuthLogout:
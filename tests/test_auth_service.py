@@ -1,6 +1,6 @@
 """Tests for the auth service layer."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
@@ -11,10 +11,12 @@ from app.api.services.auth_service import (
     decode_access_token,
     create_user,
     get_user_by_username,
+    get_user_by_id,
     authenticate_user,
     user_exists,
 )
 from app.api.schemas.auth import UserCreate
+from app.api.cache import REQUEST_USERS
 
 
 class TestPasswordHashing:
@@ -61,11 +63,33 @@ class TestJWTTokens:
         assert token_data is not None
         assert token_data.username == "bob"
 
+    def test_decode_token_includes_expiry(self):
+        token = create_access_token(
+            data={"sub": "carol"},
+            expires_delta=timedelta(minutes=5),
+        )
+        token_data = decode_access_token(token)
+        remaining = token_data.expires_at - datetime.now(timezone.utc)
+        assert timedelta(minutes=4) < remaining <= timedelta(minutes=5)
+
     def test_token_without_sub_returns_none(self):
         token = create_access_token(data={"other": "value"})
         result = decode_access_token(token)
         assert result is None
 
+    def test_decode_reuses_cached_result(self, monkeypatch):
+        token = create_access_token(data={"sub": "dave"})
+        first = decode_access_token(token)
+
+        monkeypatch.setattr("app.api.services.auth_service.jwt.decode", None)
+        assert decode_access_token(token) is first
+
+    def test_decode_caches_rejected_token(self, monkeypatch):
+        assert decode_access_token("not.a.valid.token") is None
+
+        monkeypatch.setattr("app.api.services.auth_service.jwt.decode", None)
+        assert decode_access_token("not.a.valid.token") is None
+
 
 @pytest.mark.asyncio
 class TestUserDatabase:
@@ -78,12 +102,39 @@ class TestUserDatabase:
         assert user.username == "newuser"
         assert user.id is not None
 
+    async def test_create_user_returns_inserted_row(self, db):
+        statements = []
+        await db.set_trace_callback(statements.append)
+        try:
+            user = await create_user(
+                db, UserCreate(username="newuser", password="password123")
+            )
+        finally:
+            await db.set_trace_callback(None)
+
+        assert [s for s in statements if s.startswith("SELECT")] == []
+        assert await get_user_by_id(db, user.id) == user
+
     async def test_get_user_by_username(self, db_with_user):
         user = await get_user_by_username(db_with_user, "testuser")
         assert user is not None
         assert user["username"] == "testuser"
         assert "password_hash" in user
 
+    async def test_get_user_by_username_memoized_per_request(self, db_with_user):
+        statements = []
+        await db_with_user.set_trace_callback(statements.append)
+        token = REQUEST_USERS.set({})
+        try:
+            first = await get_user_by_username(db_with_user, "testuser")
+            second = await get_user_by_username(db_with_user, "testuser")
+        finally:
+            REQUEST_USERS.reset(token)
+            await db_with_user.set_trace_callback(None)
+
+        assert second is first
+        assert len(statements) == 1
+
     async def test_get_nonexistent_user(self, db):
         user = await get_user_by_username(db, "nobody")
         assert user is None
@@ -0,0 +1,51 @@
+"""Tests for the in-process cache helpers."""
+
+from app.api.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_missing_returns_default(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        assert cache.get("missing") is None
+        assert cache.get("missing", 0) == 0
+
+    def test_set_and_get(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+    def test_expired_entry_is_dropped(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr("app.api.cache.time.monotonic", lambda: now)
+
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set("a", 1)
+
+        now = 1031.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self):
+        cache = TTLCache(maxsize=4, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.pop("a")
+        cache.pop("missing")
+        assert cache.get("a") is None
+
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,43 @@
+"""Tests for category routes."""
+
+import pytest
+
+
+@pytest.mark.asyncio
+class TestUpdateCategory:
+    """Tests for PATCH /api/categories/{id}."""
+
+    async def _create(self, client, name):
+        resp = await client.post(
+            "/api/categories", json={"name": name, "type": "expense"}
+        )
+        assert resp.status_code == 201
+        return resp.json()["id"]
+
+    async def test_update_name(self, client):
+        category_id = await self._create(client, "Groceries")
+
+        resp = await client.patch(
+            f"/api/categories/{category_id}", json={"name": "Food"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["name"] == "Food"
+
+    async def test_update_name_conflict(self, client):
+        await self._create(client, "Groceries")
+        category_id = await self._create(client, "Dining")
+
+        resp = await client.patch(
+            f"/api/categories/{category_id}", json={"name": "Groceries"}
+        )
+        assert resp.status_code == 400
+
+    async def test_update_nonexistent_category(self, client):
+        resp = await client.patch("/api/categories/9999", json={"name": "Nope"})
+        assert resp.status_code == 404
+
+    async def test_update_nonexistent_category_with_taken_name(self, client):
+        await self._create(client, "Groceries")
+
+        resp = await client.patch("/api/categories/9999", json={"name": "Groceries"})
+        assert resp.status_code == 404
@@ -0,0 +1,43 @@
+"""Tests for the category service layer."""
+
+import pytest
+
+from app.api.services.category_service import (
+    create_category,
+    get_category,
+    get_category_by_name,
+    update_category,
+)
+from app.api.schemas.category import CategoryCreate, CategoryUpdate
+
+
+@pytest.mark.asyncio
+class TestCategoryLookups:
+    """Tests for cached category lookups."""
+
+    async def test_lookups_are_cached(self, db):
+        created = await create_category(
+            db, CategoryCreate(name="Groceries", type="expense")
+        )
+
+        statements = []
+        await db.set_trace_callback(statements.append)
+        try:
+            for _ in range(3):
+                assert await get_category(db, created.id) == created
+                assert await get_category_by_name(db, "Groceries") == created
+        finally:
+            await db.set_trace_callback(None)
+
+        assert len(statements) == 2
+
+    async def test_update_invalidates_cache(self, db):
+        created = await create_category(
+            db, CategoryCreate(name="Groceries", type="expense")
+        )
+        await get_category_by_name(db, "Groceries")
+
+        await update_category(db, created.id, CategoryUpdate(name="Food"))
+
+        assert await get_category_by_name(db, "Groceries") is None
+        assert (await get_category(db, created.id)).name == "Food"
@@ -0,0 +1,175 @@
+"""Tests for database connection helpers."""
+
+import asyncio
+from types import SimpleNamespace
+
+import aiosqlite
+import pytest
+
+from app.config import DEFAULT_CATEGORIES
+from app.database import create_pool, close_pool, release_db, init_db
+from app.database import seed_categories, optimize_db, optimize_periodically
+from app.database import DBConnectionMiddleware
+from app.api.dependencies import get_db
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the database module at a throwaway file."""
+    path = tmp_path / "test.db"
+    monkeypatch.setattr("app.database.DATABASE_PATH", path)
+    return path
+
+
+@pytest.mark.asyncio
+class TestConnectionPool:
+    """Tests for the application connection pool."""
+
+    async def test_create_pool_opens_connections(self, db_path):
+        pool = await create_pool(size=3)
+        assert pool.qsize() == 3
+
+        db = pool.get_nowait()
+        cursor = await db.execute("PRAGMA foreign_keys")
+        row = await cursor.fetchone()
+        assert row[0] == 1
+
+        cursor = await db.execute("PRAGMA journal_mode")
+        row = await cursor.fetchone()
+        assert row[0] == "wal"
+
+        cursor = await db.execute("PRAGMA cache_size")
+        row = await cursor.fetchone()
+        assert row[0] < 0
+
+        pool.put_nowait(db)
+        await close_pool(pool)
+        assert pool.empty()
+
+    async def test_writers_wait_for_the_write_lock(self, db_path):
+        pool = await create_pool(size=2)
+        first, second = pool.get_nowait(), pool.get_nowait()
+        await first.execute("CREATE TABLE t (id INTEGER)")
+        await first.commit()
+
+        await first.execute("INSERT INTO t VALUES (1)")
+        pending = asyncio.ensure_future(second.execute("INSERT INTO t VALUES (2)"))
+        await asyncio.sleep(0.2)
+        assert not pending.done()
+
+        await first.commit()
+        await pending
+        await second.commit()
+
+        cursor = await first.execute("SELECT COUNT(*) FROM t")
+        assert (await cursor.fetchone())[0] == 2
+
+        pool.put_nowait(first)
+        pool.put_nowait(second)
+        await close_pool(pool)
+
+    async def test_get_db_borrows_connection(self, db_path):
+        pool = await create_pool(size=1)
+        request = SimpleNamespace(
+            app=SimpleNamespace(state=SimpleNamespace(db_pool=pool)),
+            state=SimpleNamespace(),
+        )
+
+        db = await get_db(request)
+        assert pool.empty()
+        assert request.state.db is db
+
+        await db.execute("CREATE TABLE t (id INTEGER)")
+        await db.execute("INSERT INTO t VALUES (1)")
+        assert db.in_transaction
+
+        await release_db(pool, db)
+        assert pool.qsize() == 1
+        assert not db.in_transaction
+
+        await close_pool(pool)
+
+    async def test_optimize_returns_connection_to_pool(self, db_path):
+        pool = await create_pool(size=1)
+        db = pool.get_nowait()
+        statements = []
+        await db.set_trace_callback(statements.append)
+        pool.put_nowait(db)
+
+        task = asyncio.create_task(optimize_periodically(pool, interval=0.01))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await optimize_db(pool)
+        assert statements.count("PRAGMA optimize") > 1
+        assert pool.qsize() == 1
+
+        await close_pool(pool)
+
+    async def test_middleware_returns_connection_to_pool(self, db_path):
+        pool = await create_pool(size=1)
+        db = pool.get_nowait()
+
+        async def endpoint(scope, receive, send):
+            scope["state"]["db"] = db
+
+        scope = {
+            "type": "http",
+            "app": SimpleNamespace(state=SimpleNamespace(db_pool=pool)),
+            "state": {},
+        }
+        await DBConnectionMiddleware(endpoint)(scope, None, None)
+
+        assert pool.qsize() == 1
+        assert "db" not in scope["state"]
+
+        await close_pool(pool)
+
+
+@pytest.mark.asyncio
+class TestInitDb:
+    """Tests for schema initialization."""
+
+    async def test_init_db_leaves_file_in_wal_mode(self, db_path):
+        await init_db()
+
+        async with aiosqlite.connect(db_path) as db:
+            cursor = await db.execute("PRAGMA journal_mode")
+            assert (await cursor.fetchone())[0] == "wal"
+
+    async def test_seed_categories_is_idempotent(self, db_path):
+        await init_db()
+        await seed_categories()
+        await seed_categories()
+
+        async with aiosqlite.connect(db_path) as db:
+            cursor = await db.execute(
+                "SELECT COUNT(*) FROM categories WHERE is_system = 1"
+            )
+            assert (await cursor.fetchone())[0] == len(DEFAULT_CATEGORIES)
+
+
+@pytest.mark.asyncio
+class TestForeignKeyIndexes:
+    """Tests that foreign key columns can be looked up without a scan."""
+
+    @pytest.mark.parametrize(
+        "table, column",
+        [
+            ("transactions", "account_id"),
+            ("transactions", "category_id"),
+            ("transactions", "transfer_to_account_id"),
+            ("subscriptions", "account_id"),
+            ("subscriptions", "category_id"),
+            ("loans", "account_id"),
+            ("loan_payments", "loan_id"),
+        ],
+    )
+    async def test_foreign_key_is_indexed(self, db, table, column):
+        cursor = await db.execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM {table} WHERE {column} = ?", (1,)
+        )
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+        assert plan.startswith("SEARCH"), plan
@@ -0,0 +1,231 @@
+"""Tests for the loan service layer."""
+
+from datetime import date
+
+import pytest
+import pytest_asyncio
+
+from app.api.services.loan_service import (
+    record_payment,
+    get_loan_payments,
+    generate_amortization_schedule,
+    calculate_monthly_payment,
+    get_all_loans,
+    create_loan,
+    update_loan,
+    get_loan_summary,
+)
+from app.api.schemas.loan import (
+    AmortizationEntry,
+    LoanCreate,
+    LoanUpdate,
+    LoanPayment,
+)
+
+
+@pytest_asyncio.fixture
+async def db_with_loan(db_with_user):
+    """Database pre-seeded with a single auto loan."""
+    await db_with_user.execute(
+        "INSERT INTO loans (name, loan_type, original_principal, current_balance, "
+        "interest_rate, term_months, start_date, monthly_payment) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ("Car", "auto", 10000.0, 10000.0, 6.0, 48, "2026-01-01", 234.85),
+    )
+    await db_with_user.commit()
+    return db_with_user
+
+
+@pytest.mark.asyncio
+class TestLoanPayments:
+    """Tests for recording and listing loan payments."""
+
+    async def test_record_payment_splits_interest(self, db_with_loan):
+        result = await record_payment(
+            db_with_loan,
+            1,
+            LoanPayment(amount=234.85, payment_date=date(2026, 2, 1)),
+        )
+
+        assert result.interest_paid == 50.0
+        assert result.principal_paid == 184.85
+        assert result.new_balance == 9815.15
+
+        cursor = await db_with_loan.execute(
+            "SELECT current_balance, total_paid, is_active FROM loans"
+        )
+        assert tuple(await cursor.fetchone()) == (9815.15, 234.85, 1)
+
+    async def test_record_payment_pays_off_loan(self, db_with_loan):
+        result = await record_payment(
+            db_with_loan,
+            1,
+            LoanPayment(amount=12000.0, payment_date=date(2026, 2, 1)),
+        )
+
+        assert result.principal_paid == 10000.0
+        assert result.interest_paid == 2000.0
+        assert result.new_balance == 0
+
+        cursor = await db_with_loan.execute("SELECT is_active FROM loans")
+        assert (await cursor.fetchone())[0] == 0
+
+    async def test_record_payment_missing_loan(self, db_with_user):
+        payment = LoanPayment(amount=10.0, payment_date=date(2026, 2, 1))
+        assert await record_payment(db_with_user, 9999, payment) is None
+
+    async def test_payments_missing_loan(self, db_with_user):
+        assert await get_loan_payments(db_with_user, 9999) is None
+
+    async def test_payments_empty(self, db_with_loan):
+        result = await get_loan_payments(db_with_loan, 1)
+        assert result.payments == []
+        assert result.total == 0
+
+    async def test_payments_newest_first(self, db_with_loan):
+        for month in (2, 3):
+            await record_payment(
+                db_with_loan,
+                1,
+                LoanPayment(amount=234.85, payment_date=date(2026, month, 1)),
+            )
+
+        result = await get_loan_payments(db_with_loan, 1)
+        payments = result.payments
+        assert result.total == 2
+        assert [p.payment_date for p in payments] == [
+            date(2026, 3, 1),
+            date(2026, 2, 1),
+        ]
+        assert payments[0].new_balance < payments[1].new_balance
+
+    async def test_payments_paginated(self, db_with_loan):
+        for month in (2, 3, 4):
+            await record_payment(
+                db_with_loan,
+                1,
+                LoanPayment(amount=234.85, payment_date=date(2026, month, 1)),
+            )
+
+        page = await get_loan_payments(db_with_loan, 1, limit=2, offset=2)
+        assert page.total == 3
+        assert [p.payment_date for p in page.payments] == [date(2026, 2, 1)]
+
+        past_end = await get_loan_payments(db_with_loan, 1, limit=2, offset=10)
+        assert past_end.payments == []
+        assert past_end.total == 3
+
+    async def test_payments_missing_loan_past_end(self, db_with_user):
+        assert await get_loan_payments(db_with_user, 9999, offset=10) is None
+
+
+@pytest.mark.asyncio
+class TestLoanWrites:
+    """Tests for creating and updating loans."""
+
+    async def test_create_loan(self, db_with_user):
+        await db_with_user.execute(
+            "INSERT INTO accounts (name, account_type) VALUES ('Checking', 'bank')"
+        )
+        loan = await create_loan(
+            db_with_user,
+            LoanCreate(
+                name="Car",
+                original_principal=10000.0,
+                interest_rate=6.0,
+                term_months=48,
+                start_date=date(2026, 1, 1),
+                account_id=1,
+            ),
+        )
+
+        assert loan.interest_rate == 6.0
+        assert loan.current_balance == 10000.0
+        assert loan.monthly_payment == 234.85
+        assert loan.account_name == "Checking"
+
+    async def test_update_loan(self, db_with_loan):
+        loan = await update_loan(db_with_loan, 1, LoanUpdate(name="Truck"))
+        assert loan.name == "Truck"
+        assert loan.account_name is None
+
+    async def test_update_missing_loan(self, db_with_user):
+        assert await update_loan(db_with_user, 9999, LoanUpdate(name="x")) is None
+
+
+@pytest.mark.asyncio
+class TestLoanList:
+    """Tests for listing loans."""
+
+    async def test_totals_cover_active_loans_only(self, db_with_loan):
+        await db_with_loan.execute(
+            "INSERT INTO loans (name, loan_type, original_principal, current_balance, "
+            "interest_rate, term_months, start_date, is_active) "
+            "VALUES ('Old', 'auto', 500.0, 0.0, 5.0, 12, '2020-01-01', 0)"
+        )
+
+        result = await get_all_loans(db_with_loan)
+        assert result.total == 2
+        assert result.total_balance == 10000.0
+        assert result.total_original == 10000.0
+
+    async def test_empty(self, db_with_user):
+        result = await get_all_loans(db_with_user)
+        assert result.total == 0
+        assert result.total_balance == 0
+
+    async def test_summary_counts_active_types(self, db_with_loan):
+        await db_with_loan.execute(
+            "INSERT INTO loans (name, loan_type, original_principal, current_balance, "
+            "interest_rate, term_months, start_date, is_active) "
+            "VALUES ('Old', 'student', 500.0, 0.0, 5.0, 12, '2020-01-01', 0)"
+        )
+
+        summary = await get_loan_summary(db_with_loan)
+        assert summary.total_loans == 2
+        assert summary.active_loans == 1
+        assert summary.loans_by_type == {"auto": 1}
+
+    async def test_summary_empty(self, db_with_user):
+        summary = await get_loan_summary(db_with_user)
+        assert summary.total_loans == 0
+        assert summary.loans_by_type == {}
+
+
+class TestMonthlyPayment:
+    """Tests for the monthly payment formula."""
+
+    def test_standard_loan(self):
+        assert round(calculate_monthly_payment(10000.0, 6.0, 48), 2) == 234.85
+
+    def test_tiny_rate_approaches_straight_line(self):
+        payment = calculate_monthly_payment(360000.0, 1e-9, 360)
+        assert payment == pytest.approx(1000.0, rel=1e-9)
+
+
+class TestAmortizationSchedule:
+    """Tests for the amortization schedule generator."""
+
+    def test_schedule_pays_off_principal(self):
+        schedule = generate_amortization_schedule(10000.0, 6.0, 48, date(2026, 1, 15))
+
+        assert len(schedule) == 48
+        assert schedule[0].payment_date == date(2026, 2, 15)
+        assert schedule[0].interest == 50.0
+        assert schedule[-1].balance == 0
+        assert schedule[-1].cumulative_principal == 10000.0
+        assert schedule[0].payment_amount == 234.85
+
+    def test_schedule_stops_early_on_overpayment(self):
+        schedule = generate_amortization_schedule(
+            1000.0, 0, 12, date(2026, 1, 31), monthly_payment=400.0
+        )
+
+        assert [e.principal for e in schedule] == [400.0, 400.0, 200.0]
+        assert schedule[0].payment_date == date(2026, 2, 28)
+
+    def test_entries_match_validated_models(self):
+        schedule = generate_amortization_schedule(5000.0, 4.5, 24, date(2026, 3, 1))
+
+        for entry in schedule:
+            assert AmortizationEntry.model_validate(entry.model_dump()) == entry
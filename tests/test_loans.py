@@ -0,0 +1,29 @@
+"""Tests for loan routes."""
+
+import pytest
+
+
+LOAN = {
+    "name": "Car",
+    "loan_type": "auto",
+    "original_principal": 10000.0,
+    "interest_rate": 6.0,
+    "term_months": 48,
+    "start_date": "2026-01-01",
+}
+
+
+@pytest.mark.asyncio
+class TestGetLoan:
+    """Tests for GET /api/loans/{id}."""
+
+    async def test_get_loan(self, client):
+        created = (await client.post("/api/loans", json=LOAN)).json()
+
+        resp = await client.get(f"/api/loans/{created['id']}")
+        assert resp.status_code == 200
+        assert resp.json() == created
+
+    async def test_get_missing_loan(self, client):
+        resp = await client.get("/api/loans/9999")
+        assert resp.status_code == 404
@@ -0,0 +1,296 @@
+"""Tests for report routes."""
+
+from datetime import date, timedelta
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from app.api.schemas.account import BankAccountCreate, CreditCardCreate
+from app.api.services import account_service, report_service
+
+
+async def _seed_purchases(client, count=3, start=date(2026, 1, 1)):
+    """Create the "Main" account with count daily -10.00 purchases from start."""
+    resp = await client.post(
+        "/api/accounts/bank",
+        json={"name": "Main", "account_type": "investment", "current_balance": 0},
+    )
+    account_id = resp.json()["id"]
+    for i in range(count):
+        await client.post(
+            "/api/transactions",
+            json={
+                "date": (start + timedelta(days=i)).isoformat(),
+                "amount": -10.0,
+                "description": f"Purchase, {i}",
+                "account_id": account_id,
+            },
+        )
+    return account_id
+
+
+@pytest.mark.asyncio
+class TestExportTransactions:
+    """Tests for GET /api/reports/export/transactions."""
+
+    async def test_export_transactions(self, client):
+        await _seed_purchases(client)
+        resp = await client.get("/api/reports/export/transactions")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+
+        lines = resp.text.strip().splitlines()
+        assert lines[0] == (
+            "Date,Amount,Description,Payee,Account,Category,Transfer To,Notes"
+        )
+        assert len(lines) == 4
+        assert lines[1] == '2026-01-03,-10.0,"Purchase, 2",,Main,,,'
+
+    async def test_export_spans_multiple_chunks(self, client, monkeypatch):
+        monkeypatch.setattr(report_service, "CSV_CHUNK_SIZE", 1)
+        await _seed_purchases(client, count=5)
+
+        resp = await client.get("/api/reports/export/transactions")
+        assert resp.status_code == 200
+        assert len(resp.text.strip().splitlines()) == 6
+
+    async def test_export_filters(self, client):
+        account_id = await _seed_purchases(client, count=3)
+
+        resp = await client.get(
+            "/api/reports/export/transactions",
+            params={
+                "start_date": "2026-01-02",
+                "end_date": "2026-01-02",
+                "account_id": account_id,
+            },
+        )
+        lines = resp.text.strip().splitlines()
+        assert lines[1:] == ['2026-01-02,-10.0,"Purchase, 1",,Main,,,']
+
+    async def test_export_quotes_only_when_needed(self, client):
+        account_id = await _seed_purchases(client, count=0)
+        await client.post(
+            "/api/transactions",
+            json={
+                "date": "2026-02-01",
+                "amount": 25.5,
+                "description": 'The "big" one',
+                "payee": "Plain",
+                "account_id": account_id,
+            },
+        )
+
+        resp = await client.get("/api/reports/export/transactions")
+        assert resp.text.splitlines()[1] == (
+            '2026-02-01,25.5,"The ""big"" one",Plain,Main,,,'
+        )
+
+    async def test_export_accounts(self, client):
+        await _seed_purchases(client, count=0)
+        resp = await client.get("/api/reports/export/accounts")
+        assert resp.status_code == 200
+        lines = resp.text.strip().splitlines()
+        assert len(lines) == 2
+        assert lines[1].startswith("Main,investment,0.0")
+
+
+@pytest.mark.asyncio
+class TestSpendingByCategory:
+    """Tests for GET /api/reports/spending-by-category."""
+
+    async def test_totals_and_percentages(self, client):
+        await _seed_purchases(client, count=3)
+
+        resp = await client.get(
+            "/api/reports/spending-by-category",
+            params={"start_date": "2026-01-01", "end_date": "2026-01-31"},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total_spending"] == 30.0
+        assert data["categories"][0]["percent"] == 100.0
+
+    async def test_income_only_categories_are_omitted(self, client, db_with_user):
+        account_id = await _seed_purchases(client, count=2)
+        resp = await client.post(
+            "/api/categories", json={"name": "Salary", "type": "income"}
+        )
+        await client.post(
+            "/api/transactions",
+            json={
+                "date": "2026-01-15",
+                "amount": 500.0,
+                "description": "Paycheck",
+                "account_id": account_id,
+                "category_id": resp.json()["id"],
+            },
+        )
+
+        statements = []
+        await db_with_user.set_trace_callback(statements.append)
+        try:
+            report = await report_service.get_spending_by_category(
+                db_with_user, date(2026, 1, 1), date(2026, 1, 31)
+            )
+        finally:
+            await db_with_user.set_trace_callback(None)
+
+        assert len(statements) == 1
+        assert report.total_spending == 20.0
+        assert report.total_income == 500.0
+        assert report.net == 480.0
+        assert [c.category_name for c in report.categories] == ["Uncategorized"]
+
+    async def test_empty_range(self, client):
+        resp = await client.get(
+            "/api/reports/spending-by-category",
+            params={"start_date": "2020-01-01", "end_date": "2020-01-31"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["total_spending"] == 0
+        assert resp.json()["categories"] == []
+
+
+@pytest.mark.asyncio
+class TestSpendingTrends:
+    """Tests for GET /api/reports/spending-trends."""
+
+    async def test_months_are_integers(self, client):
+        this_month = date.today().replace(day=1)
+        await _seed_purchases(client, count=3, start=this_month)
+
+        resp = await client.get("/api/reports/spending-trends", params={"months": 36})
+        assert resp.status_code == 200
+        assert resp.json()["months"] == [
+            {
+                "year": this_month.year,
+                "month": this_month.month,
+                "income": 0.0,
+                "expenses": 30.0,
+                "net": -30.0,
+            }
+        ]
+
+    async def test_averages_cover_active_months(self, client):
+        this_month = date.today().replace(day=1)
+        two_months_ago = this_month - relativedelta(months=2)
+        account_id = await _seed_purchases(client, count=3, start=this_month)
+        for amount in (-10.0, 50.0):
+            await client.post(
+                "/api/transactions",
+                json={
+                    "date": two_months_ago.isoformat(),
+                    "amount": amount,
+                    "description": "Earlier",
+                    "account_id": account_id,
+                },
+            )
+
+        resp = await client.get("/api/reports/spending-trends", params={"months": 36})
+        data = resp.json()
+
+        # Two active months (30 + 10 spent, 0 + 50 earned); the empty month
+        # between them is not counted
+        assert len(data["months"]) == 2
+        assert data["average_expenses"] == 20.0
+        assert data["average_income"] == 25.0
+
+    async def test_empty_range_averages_zero(self, client):
+        resp = await client.get("/api/reports/spending-trends")
+        assert resp.json() == {
+            "months": [],
+            "average_income": 0.0,
+            "average_expenses": 0.0,
+        }
+
+
+@pytest.mark.asyncio
+class TestNetWorthHistory:
+    """Tests for GET /api/reports/net-worth."""
+
+    async def test_history_undoes_later_transactions(self, client):
+        resp = await client.post(
+            "/api/accounts/bank",
+            json={
+                "name": "Main",
+                "account_type": "investment",
+                "current_balance": 1000.0,
+            },
+        )
+        account_id = resp.json()["id"]
+        await client.post(
+            "/api/transactions",
+            json={
+                "date": date.today().replace(day=1).isoformat(),
+                "amount": -100.0,
+                "description": "Rent",
+                "account_id": account_id,
+            },
+        )
+
+        resp = await client.get("/api/reports/net-worth", params={"months": 3})
+        assert resp.status_code == 200
+        data = resp.json()
+
+        assert [p["net_worth"] for p in data["history"]] == [1000.0, 1000.0, 900.0]
+        assert data["history"][-1]["date"] == date.today().isoformat()
+        assert data["current_net_worth"] == 900.0
+        assert data["change_amount"] == -100.0
+        assert data["change_percent"] == -10.0
+
+    async def test_history_undoes_transfers_and_loan_payments(
+        self, client, db_with_user
+    ):
+        this_month = date.today().replace(day=1)
+        last_month = this_month - relativedelta(months=1)
+
+        checking = await account_service.create_account(
+            db_with_user, BankAccountCreate(name="Checking", current_balance=1000)
+        )
+        card = await account_service.create_account(
+            db_with_user,
+            CreditCardCreate(name="Card", credit_limit=5000, current_balance=500),
+        )
+        await client.post(
+            "/api/transactions",
+            json={
+                "date": last_month.isoformat(),
+                "amount": -200.0,
+                "description": "Card payment",
+                "account_id": checking.id,
+                "transfer_to_account_id": card.id,
+            },
+        )
+
+        loan = await client.post(
+            "/api/loans",
+            json={
+                "name": "Car",
+                "original_principal": 5000,
+                "interest_rate": 0,
+                "term_months": 60,
+                "start_date": (this_month - relativedelta(months=6)).isoformat(),
+            },
+        )
+        for payment_date, amount in ((last_month, 100), (date.today(), 50)):
+            await client.post(
+                f"/api/loans/{loan.json()['id']}/payments",
+                json={"amount": amount, "payment_date": payment_date.isoformat()},
+            )
+
+        resp = await client.get("/api/reports/net-worth", params={"months": 3})
+        history = resp.json()["history"]
+
+        # Two months ago: nothing has happened yet
+        assert (history[0]["assets"], history[0]["liabilities"]) == (1000.0, 5500.0)
+        # Last month: the transfer and first payment stand, today's is undone
+        assert (history[1]["assets"], history[1]["liabilities"]) == (800.0, 5600.0)
+        # Today: current balances, loan at 4850 after both payments
+        assert (history[2]["assets"], history[2]["liabilities"]) == (800.0, 5550.0)
+
+    async def test_history_without_accounts(self, client):
+        resp = await client.get("/api/reports/net-worth", params={"months": 2})
+        data = resp.json()
+        assert [p["net_worth"] for p in data["history"]] == [0, 0]
+        assert data["change_percent"] == 0
@@ -0,0 +1,293 @@
+"""Tests for the subscription service layer."""
+
+from datetime import date
+
+import pytest
+
+from app.api.services.subscription_service import (
+    _SUBSCRIPTION_SELECT,
+    _UPCOMING_RENEWALS_SQL,
+    calculate_monthly_cost,
+    calculate_yearly_cost,
+    _row_to_subscription_response,
+    create_subscription,
+    get_all_subscriptions,
+    get_cycle_days,
+    get_cycle_display,
+    get_subscription_dicts,
+    advance_all_due,
+    advance_billing_date,
+    get_subscription,
+    update_subscription,
+)
+from app.api.schemas.subscription import SubscriptionCreate, SubscriptionUpdate
+from app.config import BILLING_CYCLES
+
+
+@pytest.mark.asyncio
+class TestCreateSubscription:
+    """Tests for creating subscriptions."""
+
+    async def test_create_reads_back_in_one_statement(self, db_with_categories):
+        db = db_with_categories
+        statements = []
+        await db.set_trace_callback(statements.append)
+        created = await create_subscription(
+            db,
+            SubscriptionCreate(
+                name="Streaming",
+                amount=15.0,
+                billing_cycle="monthly",
+                next_billing_date=date(2026, 2, 1),
+                account_id=1,
+                category_id=3,
+            ),
+        )
+        await db.set_trace_callback(None)
+
+        assert not any(s.lstrip().startswith("SELECT") for s in statements)
+        assert created.account_name == "Test Checking"
+        assert created.category_name == "Rent"
+        assert created == await get_subscription(db, created.id)
+
+
+@pytest.mark.asyncio
+class TestListSubscriptions:
+    """Tests for listing subscriptions."""
+
+    async def test_days_until_renewal_counts_from_given_today(self, db_with_categories):
+        created = await create_subscription(
+            db_with_categories,
+            SubscriptionCreate(
+                name="Streaming",
+                amount=15.0,
+                billing_cycle="monthly",
+                next_billing_date=date(2026, 2, 1),
+            ),
+        )
+        cursor = await db_with_categories.execute(
+            f"SELECT {_SUBSCRIPTION_SELECT}, NULL, NULL FROM subscriptions s "
+            "WHERE s.id = ?",
+            (created.id,),
+        )
+        row = await cursor.fetchone()
+
+        response = _row_to_subscription_response(row, date(2026, 1, 22))
+        assert response.days_until_renewal == 10
+
+    async def test_list_matches_single_lookup(self, db_with_categories):
+        created = await create_subscription(
+            db_with_categories,
+            SubscriptionCreate(
+                name="Streaming",
+                amount=15.0,
+                billing_cycle="monthly",
+                next_billing_date=date(2026, 2, 1),
+            ),
+        )
+
+        result = await get_all_subscriptions(db_with_categories)
+        assert result.subscriptions == [created]
+
+    async def test_totals_cover_active_subscriptions(self, db_with_categories):
+        db = db_with_categories
+        for name, amount, cycle, active in [
+            ("Streaming", 15.0, "monthly", True),
+            ("Gym", 20.0, "weekly", True),
+            ("Software", 120.0, "annual", True),
+            ("Cancelled", 99.0, "monthly", False),
+        ]:
+            created = await create_subscription(
+                db,
+                SubscriptionCreate(
+                    name=name,
+                    amount=amount,
+                    billing_cycle=cycle,
+                    next_billing_date=date(2026, 2, 1),
+                ),
+            )
+            if not active:
+                await update_subscription(
+                    db, created.id, SubscriptionUpdate(is_active=False)
+                )
+
+        result = await get_all_subscriptions(db)
+        assert result.total == 4
+        assert result.total_monthly_cost == round(
+            15.0 + (30 / 7) * 20.0 + (30 / 365) * 120.0, 2
+        )
+        assert result.total_yearly_cost == round(
+            (365 / 30) * 15.0 + (365 / 7) * 20.0 + 120.0, 2
+        )
+
+        inactive = await get_all_subscriptions(db, is_active=False)
+        assert [s.name for s in inactive.subscriptions] == ["Cancelled"]
+        assert inactive.total_monthly_cost == 0
+        assert inactive.total_yearly_cost == 0
+
+    async def test_dicts_match_response_models(self, db_with_categories):
+        db = db_with_categories
+        await db.execute(
+            "INSERT INTO subscriptions (name, amount, billing_cycle, "
+            "next_billing_date, account_id, category_id) "
+            "VALUES ('Music', 9.99, 'monthly', '2026-03-01', 1, 3)"
+        )
+        await db.commit()
+        await create_subscription(
+            db,
+            SubscriptionCreate(
+                name="Gym",
+                amount=20.0,
+                billing_cycle="weekly",
+                next_billing_date=date(2026, 2, 1),
+            ),
+        )
+
+        models = await get_all_subscriptions(db)
+        dicts = await get_subscription_dicts(db)
+        assert dicts == models.model_dump(mode="json")
+
+
+@pytest.mark.asyncio
+class TestUpcomingRenewals:
+    """Tests for upcoming renewal lookups."""
+
+    async def test_renewals_read_only_the_index(self, db_with_categories):
+        today = date.today()
+        cursor = await db_with_categories.execute(
+            "EXPLAIN QUERY PLAN " + _UPCOMING_RENEWALS_SQL,
+            (today.isoformat(), today.isoformat(), 10),
+        )
+        plan = " ".join(row["detail"] for row in await cursor.fetchall())
+
+        assert "COVERING INDEX idx_subscriptions_active_next_date" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestCycleCosts:
+    """Tests for billing cycle cost helpers."""
+
+    @pytest.mark.parametrize("cycle", [c["value"] for c in BILLING_CYCLES])
+    def test_costs_scale_by_cycle_days(self, cycle):
+        days = get_cycle_days(cycle)
+        assert calculate_yearly_cost(12.0, cycle) == (365 / days) * 12.0
+        assert calculate_monthly_cost(12.0, cycle) == (30 / days) * 12.0
+
+    def test_cycle_lookups(self):
+        assert get_cycle_days("biweekly") == 14
+        assert get_cycle_display("semi_annual") == "Semi-Annual"
+        assert get_cycle_days("fortnightly") == 30
+        assert get_cycle_display("fortnightly") == "fortnightly"
+
+    def test_unknown_cycle_counts_as_thirty_days(self):
+        assert calculate_yearly_cost(30.0, "fortnightly") == 365.0
+        assert calculate_monthly_cost(30.0, "fortnightly") == 30.0
+
+
+@pytest.mark.asyncio
+class TestUpdateSubscription:
+    """Tests for subscription updates."""
+
+    async def _create(self, db):
+        return await create_subscription(
+            db,
+            SubscriptionCreate(
+                name="Streaming",
+                amount=15.0,
+                billing_cycle="monthly",
+                next_billing_date=date(2026, 2, 1),
+                account_id=1,
+            ),
+        )
+
+    async def test_update_reads_back_from_the_update(self, db_with_categories):
+        db = db_with_categories
+        created = await self._create(db)
+
+        statements = []
+        await db.set_trace_callback(statements.append)
+        updated = await update_subscription(
+            db, created.id, SubscriptionUpdate(amount=18.0, category_id=3)
+        )
+        await db.set_trace_callback(None)
+
+        assert not any(s.lstrip().startswith("SELECT") for s in statements)
+        assert updated.amount == 18.0
+        assert updated.category_name == "Rent"
+        assert updated == await get_subscription(db, created.id)
+
+    async def test_update_missing_subscription(self, db_with_categories):
+        assert (
+            await update_subscription(
+                db_with_categories, 9999, SubscriptionUpdate(amount=1.0)
+            )
+            is None
+        )
+
+    async def test_advance_billing_date(self, db_with_categories):
+        db = db_with_categories
+        created = await self._create(db)
+
+        advanced = await advance_billing_date(db, created.id)
+        assert advanced.next_billing_date == date(2026, 3, 3)
+        assert advanced.account_name == "Test Checking"
+        assert advanced == await get_subscription(db, created.id)
+
+
+@pytest.mark.asyncio
+class TestAdvanceAllDue:
+    """Tests for advancing every due subscription at once."""
+
+    async def test_advances_only_due_active_subscriptions(self, db_with_categories):
+        db = db_with_categories
+        created = {}
+        for name, cycle, next_date in [
+            ("Weekly", "weekly", date(2026, 1, 30)),
+            ("Annual", "annual", date(2026, 1, 31)),
+            ("Later", "monthly", date(2026, 2, 1)),
+            ("Paused", "monthly", date(2026, 1, 1)),
+        ]:
+            created[name] = await create_subscription(
+                db,
+                SubscriptionCreate(
+                    name=name,
+                    amount=10.0,
+                    billing_cycle=cycle,
+                    next_billing_date=next_date,
+                    account_id=1,
+                ),
+            )
+        await update_subscription(
+            db, created["Paused"].id, SubscriptionUpdate(is_active=False)
+        )
+
+        advanced = await advance_all_due(db, as_of=date(2026, 1, 31))
+
+        assert {s.name: s.next_billing_date for s in advanced} == {
+            "Weekly": date(2026, 2, 6),
+            "Annual": date(2027, 1, 31),
+        }
+        assert advanced[0].account_name == "Test Checking"
+        for subscription in created.values():
+            current = await get_subscription(db, subscription.id)
+            if subscription.name in ("Later", "Paused"):
+                assert current.next_billing_date == subscription.next_billing_date
+
+    async def test_matches_single_advance(self, db_with_categories):
+        db = db_with_categories
+        created = await create_subscription(
+            db,
+            SubscriptionCreate(
+                name="Quarterly",
+                amount=10.0,
+                billing_cycle="quarterly",
+                next_billing_date=date(2026, 1, 15),
+            ),
+        )
+        expected = (await advance_billing_date(db, created.id)).next_billing_date
+
+        await update_subscription(
+            db, created.id, SubscriptionUpdate(next_billing_date=date(2026, 1, 15))
+        )
+        [advanced] = await advance_all_due(db, as_of=date(2026, 1, 15))
+        assert advanced.next_billing_date == expected
@@ -1,7 +1,12 @@
 """Tests for transaction routes."""
 
+from datetime import date
+
 import pytest
 
+from app.api.services import transaction_service
+from app.api.schemas.transaction import TransactionCreate, TransactionUpdate
+
 
 @pytest.mark.asyncio
 class TestCreateTransaction:
@@ -35,6 +40,38 @@ class TestCreateTransaction:
         assert data["description"] == "Groceries"
         assert data["account_id"] == account_id
 
+    async def test_create_transaction_reads_back_in_one_statement(
+        self, db_with_categories
+    ):
+        db = db_with_categories
+        statements = []
+        await db.set_trace_callback(statements.append)
+        created = await transaction_service.create_transaction(
+            db,
+            TransactionCreate(
+                date="2026-01-15", amount=-50.0, account_id=1, category_id=2
+            ),
+        )
+        await db.set_trace_callback(None)
+
+        assert not any(s.lstrip().startswith("SELECT") for s in statements)
+        assert created.account_name == "Test Checking"
+        assert created.category_name == "Groceries"
+        assert created == await transaction_service.get_transaction(db, created.id)
+
+    async def test_create_transaction_updates_balance_once(self, db_with_categories):
+        db = db_with_categories
+        statements = []
+        await db.set_trace_callback(statements.append)
+        await transaction_service.create_transaction(
+            db, TransactionCreate(date="2026-01-15", amount=-50.0, account_id=1)
+        )
+        await db.set_trace_callback(None)
+
+        assert sum(s.lstrip().startswith("UPDATE") for s in statements) == 1
+        cursor = await db.execute("SELECT current_balance FROM accounts WHERE id = 1")
+        assert (await cursor.fetchone())[0] == 950.0
+
     async def test_create_transaction_invalid_account(self, client):
         resp = await client.post(
             "/api/transactions",
@@ -62,6 +99,41 @@ class TestCreateTransaction:
         assert resp.status_code == 400
         assert "same account" in resp.json()["detail"]
 
+    async def test_create_transfer(self, client):
+        source_id = await self._create_account(client, "Source", 1000.0)
+        dest_id = await self._create_account(client, "Dest", 1000.0)
+        resp = await client.post(
+            "/api/transactions",
+            json={
+                "date": "2026-01-15",
+                "amount": -100.0,
+                "description": "Move money",
+                "account_id": source_id,
+                "transfer_to_account_id": dest_id,
+            },
+        )
+        assert resp.status_code == 201
+        assert resp.json()["transfer_to_account_name"] == "Dest"
+
+        source = (await client.get(f"/api/accounts/{source_id}")).json()
+        dest = (await client.get(f"/api/accounts/{dest_id}")).json()
+        assert source["current_balance"] == 900.0
+        assert dest["current_balance"] == 1100.0
+
+    async def test_create_transfer_missing_destination(self, client):
+        account_id = await self._create_account(client)
+        resp = await client.post(
+            "/api/transactions",
+            json={
+                "date": "2026-01-15",
+                "amount": -100.0,
+                "account_id": account_id,
+                "transfer_to_account_id": 9999,
+            },
+        )
+        assert resp.status_code == 400
+        assert "destination" in resp.json()["detail"]
+
     async def test_create_transaction_unauthenticated(self, unauth_client):
         resp = await unauth_client.post(
             "/api/transactions",
@@ -123,6 +195,132 @@ class TestListTransactions:
         )
         assert resp.status_code == 200
 
+    async def test_list_transactions_single_query(self, db_with_categories):
+        db = db_with_categories
+        for i in range(5):
+            await db.execute(
+                "INSERT INTO transactions (date, amount, account_id, category_id) "
+                "VALUES (?, ?, 1, 2)",
+                (f"2026-01-{10 + i:02d}", -10.0),
+            )
+        await db.commit()
+
+        statements = []
+        await db.set_trace_callback(statements.append)
+        result = await transaction_service.get_transactions(db, limit=2)
+        await db.set_trace_callback(None)
+
+        assert len(statements) == 1
+        assert result.total == 5
+        assert len(result.transactions) == 2
+        assert result.transactions[0].account_name == "Test Checking"
+        assert result.transactions[0].category_name == "Groceries"
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {"account_id": 1},
+            {"category_id": 2},
+        ],
+    )
+    async def test_list_filters_use_indexes(self, db_with_categories, filters):
+        db = db_with_categories
+        statements = []
+        await db.set_trace_callback(statements.append)
+        await transaction_service.get_transactions(db, **filters)
+        await db.set_trace_callback(None)
+
+        cursor = await db.execute("EXPLAIN QUERY PLAN " + statements[0])
+        plan = [row["detail"] for row in await cursor.fetchall()]
+        assert not any(detail.startswith("SCAN t") for detail in plan)
+
+    async def test_search_in_date_range_scans_the_range(self, db_with_categories):
+        db = db_with_categories
+        statements = []
+        await db.set_trace_callback(statements.append)
+        await transaction_service.get_transactions(
+            db,
+            search="groceries",
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 1, 31),
+        )
+        await db.set_trace_callback(None)
+
+        cursor = await db.execute("EXPLAIN QUERY PLAN " + statements[0])
+        plan = [row["detail"] for row in await cursor.fetchall()]
+        assert any("idx_transactions_date" in detail for detail in plan)
+
+    async def _search(self, db, search):
+        result = await transaction_service.get_transactions(db, search=search)
+        return sorted(t.description for t in result.transactions)
+
+    async def test_search_matches_substrings(self, db_with_categories):
+        db = db_with_categories
+        for description, payee, notes in [
+            ("Weekly groceries", "FreshMart", None),
+            ("Coffee", "Bean There", "with Sam"),
+            ("Rent", None, "March 100% paid"),
+        ]:
+            await transaction_service.create_transaction(
+                db,
+                TransactionCreate(
+                    date="2026-01-15",
+                    amount=-10.0,
+                    description=description,
+                    payee=payee,
+                    notes=notes,
+                    account_id=1,
+                ),
+            )
+
+        assert await self._search(db, "GROCER") == ["Weekly groceries"]
+        assert await self._search(db, "mart") == ["Weekly groceries"]
+        assert await self._search(db, "th Sa") == ["Coffee"]
+        assert await self._search(db, "100%") == ["Rent"]
+        assert await self._search(db, 'say "hi"') == []
+        assert await self._search(db, "re") == ["Coffee", "Rent", "Weekly groceries"]
+
+    async def test_search_follows_updates_and_deletes(self, db_with_categories):
+        db = db_with_categories
+        created = await transaction_service.create_transaction(
+            db,
+            TransactionCreate(
+                date="2026-01-15", amount=-10.0, description="Bakery", account_id=1
+            ),
+        )
+
+        await transaction_service.update_transaction(
+            db, created.id, TransactionUpdate(description="Butcher")
+        )
+        assert await self._search(db, "Bakery") == []
+        assert await self._search(db, "Butcher") == ["Butcher"]
+
+        await transaction_service.delete_transaction(db, created.id)
+        assert await self._search(db, "Butcher") == []
+
+    async def test_list_dicts_match_response_models(self, db_with_categories):
+        db = db_with_categories
+        await db.execute(
+            "INSERT INTO transactions (date, amount, account_id, category_id) "
+            "VALUES ('2026-01-10', -10.0, 1, 2)"
+        )
+        await db.commit()
+        await transaction_service.create_transaction(
+            db, TransactionCreate(date="2026-01-11", amount=25.5, account_id=1)
+        )
+
+        models = await transaction_service.get_transactions(db)
+        dicts = await transaction_service.get_transaction_dicts(db)
+        assert dicts == models.model_dump(mode="json")
+
+    async def test_list_transactions_offset_past_end(self, client):
+        await self._seed(client)
+        resp = await client.get("/api/transactions", params={"offset": 100})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["transactions"] == []
+        assert data["total"] == 3
+
 
 @pytest.mark.asyncio
 class TestGetTransaction:
@@ -154,6 +352,64 @@ class TestGetTransaction:
         assert resp.status_code == 404
 
 
+@pytest.mark.asyncio
+class TestUpdateTransaction:
+    """Tests for PATCH /api/transactions/{id}."""
+
+    async def test_update_transaction_amount(self, client):
+        resp = await client.post(
+            "/api/accounts/bank",
+            json={"name": "Acc", "account_type": "investment", "current_balance": 1000},
+        )
+        account_id = resp.json()["id"]
+        create_resp = await client.post(
+            "/api/transactions",
+            json={
+                "date": "2026-02-01",
+                "amount": -25.0,
+                "description": "Coffee",
+                "account_id": account_id,
+            },
+        )
+        txn_id = create_resp.json()["id"]
+
+        resp = await client.patch(f"/api/transactions/{txn_id}", json={"amount": -40.0})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["amount"] == -40.0
+        assert data["account_name"] == "Acc"
+
+        resp = await client.get(f"/api/accounts/{account_id}")
+        assert resp.json()["current_balance"] == 960.0
+
+    async def test_update_transaction_not_found(self, client):
+        resp = await client.patch("/api/transactions/9999", json={"amount": -1.0})
+        assert resp.status_code == 404
+
+    async def test_update_description_not_found(self, client):
+        resp = await client.patch(
+            "/api/transactions/9999", json={"description": "Nothing"}
+        )
+        assert resp.status_code == 404
+
+    async def test_update_skips_full_refetch(self, db_with_categories):
+        db = db_with_categories
+        created = await transaction_service.create_transaction(
+            db, TransactionCreate(date="2026-01-15", amount=-50.0, account_id=1)
+        )
+
+        statements = []
+        await db.set_trace_callback(statements.append)
+        updated = await transaction_service.update_transaction(
+            db, created.id, TransactionUpdate(amount=-20.0, category_id=2)
+        )
+        await db.set_trace_callback(None)
+
+        assert not any("JOIN" in statement for statement in statements)
+        assert updated.category_name == "Groceries"
+        assert updated == await transaction_service.get_transaction(db, created.id)
+
+
 @pytest.mark.asyncio
 class TestRecentTransactions:
     """Tests for GET /api/transactions/recent."""
@@ -182,3 +438,95 @@ class TestRecentTransactions:
         resp = await client.get("/api/transactions/recent", params={"limit": 3})
         assert resp.status_code == 200
         assert len(resp.json()) == 3
+
+
+@pytest.mark.asyncio
+class TestMonthlySpending:
+    """Tests for monthly spending by category."""
+
+    async def test_spending_grouped_by_category(self, db_with_categories):
+        db = db_with_categories
+        for day, amount, category_id in [
+            ("2026-01-05", -40.0, 2),
+            ("2026-01-20", -60.0, 2),
+            ("2026-01-01", -900.0, 3),
+            ("2026-01-15", 2500.0, 1),
+            ("2026-02-01", -75.0, 2),
+        ]:
+            await db.execute(
+                "INSERT INTO transactions (date, amount, account_id, category_id) "
+                "VALUES (?, ?, 1, ?)",
+                (day, amount, category_id),
+            )
+        await db.commit()
+
+        result = await transaction_service.get_monthly_spending(db, 2026, 1)
+        assert result.model_dump() == {
+            "data": [
+                {
+                    "month": "2026-01",
+                    "category_id": 3,
+                    "category_name": "Rent",
+                    "total": 900.0,
+                },
+                {
+                    "month": "2026-01",
+                    "category_id": 2,
+                    "category_name": "Groceries",
+                    "total": 100.0,
+                },
+            ],
+            "total_spent": 1000.0,
+            "month": "2026-01",
+        }
+
+    async def test_empty_month(self, db_with_categories):
+        result = await transaction_service.get_monthly_spending(
+            db_with_categories, 2026, 12
+        )
+        assert result.data == []
+        assert result.total_spent == 0.0
+
+
+@pytest.mark.asyncio
+class TestTransferBalances:
+    """Tests for keeping both sides of a transfer in balance."""
+
+    async def _balances(self, db):
+        cursor = await db.execute("SELECT current_balance FROM accounts ORDER BY id")
+        return [row[0] for row in await cursor.fetchall()]
+
+    async def test_update_and_delete_move_both_accounts(self, db_with_categories):
+        db = db_with_categories
+        await db.execute(
+            "INSERT INTO accounts (name, account_type, current_balance) "
+            "VALUES ('Savings', 'bank', 500.0)"
+        )
+        created = await transaction_service.create_transaction(
+            db,
+            TransactionCreate(
+                date="2026-01-15",
+                amount=-100.0,
+                account_id=1,
+                transfer_to_account_id=2,
+            ),
+        )
+        assert await self._balances(db) == [900.0, 600.0]
+
+        statements = []
+        await db.set_trace_callback(statements.append)
+        await transaction_service.update_transaction(
+            db, created.id, TransactionUpdate(amount=-150.0)
+        )
+        assert await self._balances(db) == [850.0, 650.0]
+
+        assert await transaction_service.delete_transaction(db, created.id)
+        await db.set_trace_callback(None)
+
+        assert await self._balances(db) == [1000.0, 500.0]
+        assert sum("UPDATE accounts" in s for s in statements) == 2
+
+    async def test_delete_missing_transaction(self, db_with_categories):
+        assert not await transaction_service.delete_transaction(
+            db_with_categories, 9999
+        )